@@ -0,0 +1,215 @@
+"""
+Date: Oct.19.2026
+
+Description: Host-side simulator for the embedded RDES2 encoder; compiles
+			 rdes2.cpp as a shared library, drives it through ctypes, and
+			 checks its output byte-for-byte against rdes.py. No hardware
+			 needed. Run "python hostSim.py --help".
+"""
+
+from array import array
+from time import perf_counter
+import subprocess
+import tempfile
+import argparse
+import ctypes
+import random
+import sys
+import os
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+# rdes.py & rdesFuzz.py live one directory up
+sys.path.insert(0, os.path.dirname(HERE))
+from rdes import RDESCompressor
+from rdesFuzz import randomTable, boundaryTable
+
+
+## Stand-in for the Arduino core; rdes2.cpp only needs the integer types
+ARDUINO_SHIM = """
+#ifndef Arduino_h
+#define Arduino_h
+#include <stdint.h>
+#include <stddef.h>
+#endif
+"""
+
+## C entry points wrapping the RDES2Comp class
+HOST_WRAPPER = """
+#include "rdes2.h"
+
+extern "C" {
+
+RDES2Comp* rdes2New(uint8_t numCols, uint16_t originRefreshInt, uint8_t storage[]) {
+  return new RDES2Comp(numCols, originRefreshInt, storage);
+}
+
+void rdes2Free(RDES2Comp* comp) {
+  delete comp;
+}
+
+// Writes rows of a flat row-major table; returns the compressed size
+uint32_t rdes2WriteRows(RDES2Comp* comp, uint32_t data[], uint32_t rows, uint8_t numCols) {
+  for (uint32_t row=0; row<rows; row++) {
+    comp->writeRow(data + row*numCols);
+  }
+  return comp->getSize();
+}
+
+}
+"""
+
+
+def build(cxx:str=None, flags:list=None, outDir:str=None):
+	"""
+	Compiles rdes2.cpp (with an Arduino.h shim and C entry points)
+	into a shared library, and returns its path.
+
+	The compiler defaults to $CXX, or "c++"; flags default to -O2.
+	Files are written to outDir (default: a new temporary directory).
+	"""
+	cxx = cxx or os.environ.get("CXX", "c++")
+	flags = ["-O2"] if (flags is None) else flags
+	outDir = outDir or tempfile.mkdtemp(prefix="rdes2host")
+	with open(os.path.join(outDir, "Arduino.h"), "w") as f:
+		f.write(ARDUINO_SHIM)
+	wrapper = os.path.join(outDir, "rdes2Host.cpp")
+	with open(wrapper, "w") as f:
+		f.write(HOST_WRAPPER)
+	lib = os.path.join(outDir, "librdes2.so")
+	command = [cxx, *flags, "-shared", "-fPIC", "-I", outDir, "-I", HERE,
+		os.path.join(HERE, "rdes2.cpp"), wrapper, "-o", lib]
+	result = subprocess.run(command, capture_output=True, text=True)
+	if (result.returncode != 0):
+		raise RuntimeError(f"Compiling rdes2.cpp failed:\n{' '.join(command)}\n{result.stderr}")
+	return lib
+
+
+
+class EmbeddedRDES2():
+	"""
+	The embedded RDES2 encoder (RDES2Comp from rdes2.cpp), loaded
+	from a library built by build().
+	"""
+
+	def __init__(self, lib:str):
+		self.__lib = ctypes.CDLL(lib)
+		self.__lib.rdes2New.argtypes = [ctypes.c_uint8, ctypes.c_uint16, ctypes.c_void_p]
+		self.__lib.rdes2New.restype = ctypes.c_void_p
+		self.__lib.rdes2Free.argtypes = [ctypes.c_void_p]
+		self.__lib.rdes2Free.restype = None
+		self.__lib.rdes2WriteRows.argtypes = [ctypes.c_void_p, ctypes.c_void_p, ctypes.c_uint32, ctypes.c_uint8]
+		self.__lib.rdes2WriteRows.restype = ctypes.c_uint32
+
+
+	def compress(self, rows, numCols:int, originRefreshInterval:int=0):
+		"""
+		Compresses rows (lists of unsigned values) with a fresh
+		RDES2Comp, as a device would; returns (compressed bytes,
+		seconds spent in writeRow()).
+		"""
+		if (not 1 <= numCols <= 255 or not 0 <= originRefreshInterval <= 65535):
+			raise ValueError("numCols must be 1..255 & originRefreshInterval 0..65535 (device types)")
+		data = array("I", [val for row in rows for val in row])
+		## Worst case: every value stored raw
+		storage = (ctypes.c_uint8 * max(4*len(data), 1))()
+		dataPtr = data.buffer_info()[0]
+		comp = self.__lib.rdes2New(numCols, originRefreshInterval, storage)
+		try:
+			start = perf_counter()
+			size = self.__lib.rdes2WriteRows(comp, dataPtr, len(rows), numCols)
+			elapsed = perf_counter() - start
+		finally:
+			self.__lib.rdes2Free(comp)
+		return bytes(storage[:size]), elapsed
+
+
+
+def pythonCompress(rows, numCols:int, originRefreshInterval:int=0):
+	"""
+	Compresses rows with RDESCompressor(variant=2).
+	"""
+	comp = RDESCompressor(variant=2, numCols=numCols, originRefreshInterval=originRefreshInterval)
+	comp.writeCompressedRows(rows)
+	return bytes(comp.getCompressedData())
+
+
+def _firstDifference(a, b):
+	"""
+	Returns the index of the first differing byte.
+	"""
+	for i, (x, y) in enumerate(zip(a, b)):
+		if (x != y): return i
+	return min(len(a), len(b))
+
+
+def crossValidate(device:EmbeddedRDES2, cases:int=200, seed:int=None, maxRows:int=2000, verbose:bool=False):
+	"""
+	Compresses the RDES2 boundary table & random tables (see
+	rdesFuzz.py) on both encoders; returns the number of tables
+	whose bytes differ.
+	"""
+	seed = random.randrange(2**32) if (seed is None) else seed
+	print(f"Cross-validating rdes2.cpp against rdes.py: seed={seed}, cases={cases}")
+	failures = 0
+	tables = [(f"boundary refresh={refresh}", boundaryTable(2), refresh) for refresh in (0, 1, 3)]
+	for case in range(cases):
+		rng = random.Random(seed * 1000003 + case)
+		rows = randomTable(rng, maxRows)[0]
+		tables.append((f"case {case} (seed {seed})", rows, rng.choice((0, 0, 1, 2, 5, 17, 1000))))
+
+	for label, rows, refresh in tables:
+		if (not rows): continue
+		numCols = len(rows[0])
+		expected = pythonCompress(rows, numCols, refresh)
+		got = device.compress(rows, numCols, refresh)[0]
+		if (got != expected):
+			failures += 1
+			pos = _firstDifference(got, expected)
+			print(f"MISMATCH {label}: {len(rows)} rows x {numCols} cols, refresh={refresh}; "
+				f"{len(got)}B vs {len(expected)}B, first difference at byte {pos}")
+			if (verbose):
+				print(f"\tdevice: {got[max(pos-8, 0):pos+8].hex(' ')}")
+				print(f"\trdes.py: {expected[max(pos-8, 0):pos+8].hex(' ')}")
+	print(f"{failures} mismatch(es) in {len(tables)} tables")
+	return failures
+
+
+def benchmark(device:EmbeddedRDES2, numRows:int=200000, numCols:int=3, repeats:int=5):
+	"""
+	Prints the per-row encode cost of the embedded encoder (best of
+	several runs, on this host) for random walks of several step
+	sizes, next to RDESCompressor(variant=2).
+	"""
+	print(f"Encode cost per row ({numRows} rows x {numCols} cols, best of {repeats}):")
+	rng = random.Random(0)
+	for maxStep in (2**4, 2**12, 2**20, 2**30):
+		vals = [2**30]*numCols
+		rows = []
+		for r in range(numRows):
+			vals = [min(max(val + rng.randint(-maxStep, maxStep), 0), (2**31)-1) for val in vals]
+			rows.append(vals)
+		best = min(device.compress(rows, numCols)[1] for k in range(repeats))
+		start = perf_counter()
+		size = len(pythonCompress(rows, numCols))
+		python = perf_counter() - start
+		print(f"\tsteps up to 2^{maxStep.bit_length()-1}: rdes2.cpp {best*1e9/numRows:8.1f} ns/row, "
+			f"rdes.py {python*1e9/numRows:8.1f} ns/row, ratio {numRows*numCols*4/size:.3f}")
+
+
+if __name__ == "__main__":
+	parser = argparse.ArgumentParser(description="Build rdes2.cpp for this host, check it against rdes.py & time it.")
+	parser.add_argument("--cases", type=int, default=200, help="random tables to cross-validate")
+	parser.add_argument("--seed", type=int, help="seed (printed on every run, for reproducing mismatches)")
+	parser.add_argument("--max-rows", type=int, default=2000, help="max rows per random table")
+	parser.add_argument("--bench-rows", type=int, default=200000, help="rows per benchmark table (0 = skip)")
+	parser.add_argument("--cxx", help="C++ compiler (default: $CXX or c++)")
+	parser.add_argument("--cflags", default="-O2", help="compiler flags")
+	parser.add_argument("-v", "--verbose", action="store_true", help="print the bytes around each mismatch")
+	args = parser.parse_args()
+
+	with tempfile.TemporaryDirectory(prefix="rdes2host") as outDir:
+		device = EmbeddedRDES2(build(args.cxx, args.cflags.split(), outDir))
+		failures = crossValidate(device, args.cases, args.seed, args.max_rows, args.verbose)
+		if (args.bench_rows):
+			benchmark(device, args.bench_rows)
+	sys.exit(1 if failures else 0)
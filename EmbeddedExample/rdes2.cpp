@@ -135,5 +135,7 @@ bool RDES2Comp::writeRow(uint32_t rowData[]) {
     // Store new value for this column
     _lastValsPntr[col] = rowData[col];
   }//for
+  // Count towards the next origin refresh
+  _rowsSinceRaw++;
   return true;
 }//writeRow()
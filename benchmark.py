@@ -222,11 +222,11 @@ def compressionBenchmarkRandom():
 		print(f"{maxVar}{tabs}{rdes1CompTime:.0f}ms,{rdes1DecompTime:.0f}ms\t{rdes2CompTime:.0f}ms,{rdes2DecompTime:.0f}ms\t{rdes3CompTime:.0f}ms,{rdes3DecompTime:.0f}ms")
 
 
-
-ratioBenchmarkLinear()
-print("\n")
-ratioBenchmarkRandom()
-print("\n")
-compressionBenchmarkLinear()
-print("\n")
-compressionBenchmarkRandom()
\ No newline at end of file
+if __name__ == "__main__":
+	ratioBenchmarkLinear()
+	print("\n")
+	ratioBenchmarkRandom()
+	print("\n")
+	compressionBenchmarkLinear()
+	print("\n")
+	compressionBenchmarkRandom()
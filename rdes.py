@@ -8,7 +8,85 @@ Description: RDES demo implementation (all 3 variants). Designed for
 			 implementation is absolutely possible.
 """
 
-from byteTools import byte, checkBit, byte2Str
+from byteTools import byte2Str
+from time import perf_counter
+import struct
+
+
+## Checkpoint layouts (see getState()); little-endian
+STATE_MAGIC = b"RDES"
+STATE_VERSION = 1
+# magic, kind, version, variant, numCols, initialized, rowsSinceRaw
+COMP_STATE_HEADER = struct.Struct("<4scBBHBI")
+# magic, kind, version, variant, numCols, curCol
+DECO_STATE_HEADER = struct.Struct("<4scBBHH")
+
+
+## Optional front ends & backends, only imported on first use
+## (e.g. "from rdes import RDESStore"); keeps "import rdes" light
+_LAZY_MODULES = {
+	"RDESTable": "rdesTable",
+	"RDESStats": "rdesStats",
+	"RDESBlockCache": "rdesCache",
+	"RDESFileReader": "rdesReader",
+	"RDESStore": "rdesStore",
+	"RDESShardedCompressor": "rdesConcurrent",
+	"RDESTimedCompressor": "rdesTime",
+	"RDESTimedDecompressor": "rdesTime",
+	"RDESRingCompressor": "rdesRing",
+	"compressFrame": "rdesFrame",
+	"decompressFrame": "rdesFrame",
+	"decompressBatch": "rdesFrame",
+	"getSignedCols": "rdesFrame",
+}
+
+
+def __getattr__(name):
+	"""
+	Loads the optional module providing the given name on first
+	access (see _LAZY_MODULES).
+	"""
+	module = _LAZY_MODULES.get(name)
+	if (module is None):
+		raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+	from importlib import import_module
+	value = getattr(import_module(module), name)
+	globals()[name] = value
+	return value
+
+
+## Bit-packed variant (RDES4); blocks of whole rows, little-endian
+PACKED_VARIANT = 4
+# rows in the block
+PACKED_BLOCK_HEADER = struct.Struct("<H")
+# per column: first value, frame of reference (min delta), bit width, exceptions
+PACKED_COLUMN_HEADER = struct.Struct("<IiBH")
+# per exception: delta index, value (minus the frame of reference)
+PACKED_EXCEPTION = struct.Struct("<HI")
+# Maximum rows per block
+PACKED_MAX_ROWS = 2**16 - 1
+
+
+def _unpackState(state, header, kind, variant, numCols):
+	"""
+	Unpacks and validates the header of a checkpoint.
+
+	Returns (header fields, remaining 64-bit values).
+	"""
+	state = memoryview(state).cast("B")
+	if (len(state) < header.size):
+		raise ValueError("RDES state is truncated")
+	fields = header.unpack_from(state)
+	if (fields[0] != STATE_MAGIC or fields[1] != kind):
+		raise ValueError("Not an RDES state of the expected kind")
+	if (fields[2] != STATE_VERSION):
+		raise ValueError(f"Unsupported RDES state version {fields[2]}")
+	if (fields[3] != variant or fields[4] != numCols):
+		raise ValueError(f"RDES state is for RDES{fields[3]} with {fields[4]} columns, not RDES{variant} with {numCols}")
+	rest = state[header.size:]
+	if (len(rest) % 8 != 0):
+		raise ValueError("RDES state is truncated")
+	return fields, struct.unpack(f"<{len(rest)//8}q", rest)
 
 
 class RDESCompressor():
@@ -16,7 +94,9 @@ class RDESCompressor():
 	A demo RDES compressor class for UNSIGNED 31-bit values.
 	Use RDESCompressor.unsignify() to store signed values.
 
-	Supports RDES variants: RDES1, RDES2, RDES3
+	Supports RDES variants: RDES1, RDES2, RDES3, and the bit-packed
+	RDES4 (see __writeRowPacked()), which buffers blockRows rows
+	at a time
 
 	Designed to handle data in table-form. Each "column"
 	is treated as an independent sequence.
@@ -24,11 +104,19 @@ class RDESCompressor():
 	Can accept a sequence of integers and
 	produce a compressed array of data in real-time.
 
+	Pass an RDESStats object (see rdesStats.py) to collect per-column
+	level histograms & timing counters; disabled by default.
+
+	Pass a trace hook (any callable accepting a string, such as print
+	or a logger's debug method) to receive bit-level debug output.
+	verbose=True is shorthand for trace=print. Without a hook, the
+	compression loops contain no debug code.
+
 	NOTE: The decompressor must have matching column & signify settings,
 	or else decompressed data will be corrupted!
 	"""
 
-	def __init__(self, variant:int=3, numCols:int=3, verbose:bool=False, originRefreshInterval:int=0):
+	def __init__(self, variant:int=3, numCols:int=3, verbose:bool=False, originRefreshInterval:int=0, stats=None, trace=None, blockRows:int=256):
 		# The RDES variant
 		self.__variant = variant
 		# Number of columns in the virtual table
@@ -36,8 +124,27 @@ class RDESCompressor():
 		# After how many rows should a raw value be written regardless
 		# (prevents mass corruption)
 		self.__originRefreshInterval = originRefreshInterval
-		# If debug data should be printed to the console
-		self.__verbose = verbose
+		# Optional trace hook; receives debug strings (verbose = print)
+		self.__trace = print if (verbose and trace is None) else trace
+		# Row writer; only the traced writer carries debug code
+		self.__rowWriter = self.__writeRow if (self.__trace is None) else self.__writeRowTraced
+		# Variant-specific row compression algorithm
+		if (variant == PACKED_VARIANT):
+			if (not 1 <= blockRows <= PACKED_MAX_ROWS):
+				raise ValueError(f"blockRows must be 1..{PACKED_MAX_ROWS}")
+			self.__rowWriter = self.__writeRowPacked
+		elif (variant == 1):
+			self.__compressRow = self.__compressRowRDES1
+		elif (variant == 2):
+			self.__compressRow = self.__compressRowRDES2
+		else:
+			self.__compressRow = self.__compressRowRDES3
+		# Optional RDESStats counters (None = disabled)
+		self.__stats = stats
+		# Rows per block (RDES4 only)
+		self.__blockRows = blockRows
+		# Rows buffered for the next block (RDES4 only)
+		self.__pendingRows = []
 
 		# Compressed data cache
 		self.__compressed = bytearray()
@@ -66,6 +173,7 @@ class RDESCompressor():
 		Returns the size of the compressed data in the cache,
 		in bytes
 		"""
+		if (self.__pendingRows): self.flush()
 		return len(self.__compressed)
 
 
@@ -77,18 +185,37 @@ class RDESCompressor():
 		return self.getUncompressedSize() / self.getCompressedSize()
 
 
+	def getNumCols(self):
+		"""
+		Returns the number of columns per row
+		"""
+		return self.__numCols
+
+
 	def reset(self):
 		"""
 		Clears the internal cache of compressed data;
 		effectively clears the virtual table.
 		"""
-		if self.__verbose: print("RDESComp: Reset")
+		if (self.__trace is not None): self.__trace("RDESComp: Reset")
 		self.__compressed = bytearray()
+		self.__pendingRows = []
 		self.__rowsSinceRaw = 0
 		self.__initialized = False
 		self.__rowsCompressed = 0
 
 
+	def flush(self):
+		"""
+		Seals the rows buffered by RDES4 into a (possibly short)
+		block. Done automatically whenever the compressed data is
+		read; other variants write every row immediately, so this
+		does nothing for them.
+		"""
+		if (self.__pendingRows):
+			self.__writePackedBlock()
+
+
 	def unsignify(self, inp):
 		"""
 		Converts a signed long to an unsigned long so
@@ -107,54 +234,107 @@ class RDESCompressor():
 
 		Returns: bytearray
 		"""
+		if (self.__pendingRows): self.flush()
 		return self.__compressed
 
 
-	def __writeUint32(self, value):
+	def takeCompressedData(self):
 		"""
-		Writes a 31-bit value directly to the compressed cache.
+		Returns the current cache of compressed data and starts a
+		new, empty one, without resetting the chain state; rows
+		written afterwards continue the same stream. Useful for
+		periodically flushing to a file.
 
-		Sets the 32nd bit (MSB) to 0, denoting a uint32.
+		Returns: bytearray
+		"""
+		if (self.__pendingRows): self.flush()
+		data = self.__compressed
+		self.__compressed = bytearray()
+		self.__rowsCompressed = 0
+		return data
+
+
+	def getState(self):
 		"""
-		b1 = value>>24 & 0b01111111 #Set Bit8=0
-		b2 = byte( value>>16 )
-		b3 = byte( value>>8 )
-		b4 = byte( value )
+		Returns a compact checkpoint (bytes) of the compressor's chain
+		state: the last stored values, and rows since the last raw row.
+
+		Compressed data is not included. Restoring the checkpoint into
+		a new compressor (see restoreState()) lets new rows be appended
+		to the existing compressed data as one continuous stream,
+		without having to start with a raw row.
 
-		self.__compressed.append(b1) #MSB
-		self.__compressed.append(b2)
-		self.__compressed.append(b3)
-		self.__compressed.append(b4) #LSB
+		RDES4 blocks do not depend on each other; rows still buffered
+		are sealed into a block first, so the checkpoint never holds
+		them (take the compressed data afterwards).
+		"""
+		if (self.__pendingRows): self.flush()
+		lastVals = self.__lastVals if self.__initialized else [0]*self.__numCols
+		header = COMP_STATE_HEADER.pack(STATE_MAGIC, b"C", STATE_VERSION, self.__variant,
+			self.__numCols, self.__initialized, self.__rowsSinceRaw)
+		return header + struct.pack(f"<{self.__numCols}q", *lastVals)
 
 
-	def __write3Bytes(self, b1, b2, b3):
+	def restoreState(self, state):
 		"""
-		Writes 3 bytes directly to the compressed cache.
+		Restores a checkpoint produced by getState(), clearing the
+		cache of compressed data. Variant & column count must match.
 
-		Inputs MUST be bytes (8 bits)
+		The size/ratio accessors then only account for rows written
+		after the restore.
 		"""
-		self.__compressed.append(b1) #MSB
-		self.__compressed.append(b2)
-		self.__compressed.append(b3) #LSB
+		fields, lastVals = _unpackState(state, COMP_STATE_HEADER, b"C", self.__variant, self.__numCols)
+		if (len(lastVals) != self.__numCols):
+			raise ValueError("RDES state is truncated")
+		self.reset()
+		self.__initialized = bool(fields[5])
+		self.__rowsSinceRaw = fields[6]
+		self.__lastVals = list(lastVals) if self.__initialized else []
 
 
-	def __write2Bytes(self, b1, b2):
+	def getCompressedView(self):
 		"""
-		Writes 2 bytes directly to the compressed cache
+		Returns a zero-copy memoryview of the current cache
+		of compressed data.
 
-		Inputs MUST be bytes (8 bits)
+		NOTE: The cache cannot grow while a view is held; release()
+		the view before writing more rows.
 		"""
-		self.__compressed.append(b1) #MSB
-		self.__compressed.append(b2) #LSB
+		if (self.__pendingRows): self.flush()
+		return memoryview(self.__compressed)
 
 
-	def __write1Byte(self, b1):
+	def copyCompressedInto(self, out, pos:int=0):
+		"""
+		Copies the current cache of compressed data into a
+		caller-provided writable buffer (bytearray, mmap, shared
+		memory, ...), starting at byte index pos.
+
+		Returns the index after the last byte written.
 		"""
-		Writes 1 byte directly to the compressed cache
+		if (self.__pendingRows): self.flush()
+		end = pos + len(self.__compressed)
+		view = memoryview(out).cast("B")
+		view[pos:end] = self.__compressed
+		view.release()
+		return end
+
+
+	def getStats(self):
+		"""
+		Returns the RDESStats object collecting counters
+		for this compressor, or None if disabled.
+		"""
+		return self.__stats
+
+
+	def __writeUint32(self, value):
+		"""
+		Writes a 31-bit value directly to the compressed cache.
 
-		Inputs MUST be bytes (8 bits)
+		Sets the 32nd bit (MSB) to 0, denoting a uint32.
 		"""
-		self.__compressed.append(b1) #MSB
+		self.__compressed += (value & 0x7FFFFFFF).to_bytes(4, "big")
 
 
 	def writeCompressedRow(self, data:list):
@@ -163,39 +343,124 @@ class RDESCompressor():
 		virtual table as a new row.
 
 		Requires a list of data, each element being its own column.
+		Any indexable sequence of ints (including memoryview and
+		array.array rows) is accepted; it is not modified or kept.
+		"""
+		## Fast path when not collecting stats; RDES4 records its
+		## stats itself, as rows are buffered & blocks are sealed
+		stats = self.__stats
+		if (stats is None or self.__variant == PACKED_VARIANT):
+			self.__rowWriter(data)
+			return
+
+		## Time & measure the row
+		start = perf_counter()
+		sizeBefore = len(self.__compressed)
+		self.__rowWriter(data)
+		stats.recordEncode(1, len(self.__compressed) - sizeBefore, perf_counter() - start)
+
+
+	def writeCompressedRows(self, rows):
+		"""
+		Compresses several rows at once.
+
+		Accepts either a sequence of rows, or an object supporting
+		the buffer protocol (memoryview, array.array('l'), NumPy
+		integer array, mmap) holding values in row-major order; the
+		buffer is read in place.
+		"""
+		## Flat buffers are walked in row-sized slices
+		try:
+			view = memoryview(rows)
+		except TypeError:
+			view = None
+		if (view is not None):
+			numCols = self.__numCols
+			if (view.ndim == 2 and view.shape[1] != numCols):
+				shape = view.shape
+				view.release()
+				raise ValueError(f"Buffer has {shape[1]} columns per row; expected {numCols}")
+			if (view.ndim != 1):
+				view = view.cast("B").cast(view.format)
+			if (len(view) % numCols != 0):
+				size = len(view)
+				view.release()
+				raise ValueError(f"Buffer holds {size} values; not a multiple of {numCols} columns")
+			for k in range(0, len(view), numCols):
+				self.writeCompressedRow(view[k:k+numCols])
+			view.release()
+			return
+
+		for row in rows:
+			self.writeCompressedRow(row)
+
+
+	def __writeRow(self, data:list):
+		"""
+		Compresses the given row; see writeCompressedRow().
 		"""
 		## Note new row
 		self.__rowsCompressed += 1
 
 		## Write unmodified data is it is the first row
 		if (not self.__initialized):
-			self.__lastVals = data
+			self.__lastVals = list(data)
 			for val in data:
 				self.__writeUint32(val)
 			self.__initialized = True
-			if self.__verbose: print("RDESComp: Initialized")
+			if (self.__stats is not None): self.__stats.recordRawRow()
 			return
 
 		## Write unmodified data if origin refresh interval met
 		if (self.__originRefreshInterval > 0 and self.__rowsSinceRaw >= self.__originRefreshInterval):
-			self.__lastVals = data
+			self.__lastVals = list(data)
 			self.__rowsSinceRaw = 0
 			for val in data:
 				self.__writeUint32(val)
-			if self.__verbose: print("RDESComp: Origin Refresh")
+			if (self.__stats is not None): self.__stats.recordRawRow()
 			return
 
+		## Record offsets (before state is updated)
+		if (self.__stats is not None): self.__stats.recordRow(self.__lastVals, data)
+
 		## Hand-off to specific RDES variant algorithm
-		if (self.__variant == 1):
-			self.__compressRowRDES1(data)
-		elif (self.__variant == 2):
-			self.__compressRowRDES2(data)
-		else:
-			self.__compressRowRDES3(data)
+		self.__compressRow(data)
 
 		## Clean up
 		self.__rowsSinceRaw += 1
-		if self.__verbose: print("RDESComp: Row compressed")
+
+
+	def __writeRowTraced(self, data:list):
+		"""
+		Compresses the given row like __writeRow(), reporting
+		each step to the trace hook.
+		"""
+		trace = self.__trace
+		sizeBefore = len(self.__compressed)
+		wasInitialized = self.__initialized
+		refresh = (self.__originRefreshInterval > 0 and self.__rowsSinceRaw >= self.__originRefreshInterval)
+
+		## Describe each column's offset
+		if (wasInitialized and not refresh):
+			for i in range(self.__numCols):
+				newVal = data[i]
+				lastVal = self.__lastVals[i]
+				offset = abs(lastVal - newVal)
+				trace(f"RDES{self.__variant}: Compressing column {i}: {lastVal} -> {newVal}")
+				trace(f"\tOffset = {offset} = {byte2Str(offset)} (add={newVal >= lastVal})")
+
+		## Compress
+		self.__writeRow(data)
+
+		## Describe the written bytes
+		written = self.__compressed[sizeBefore:]
+		trace(f"\tWriting {len(written)} bytes: " + ", ".join(byte2Str(b) for b in written))
+		if (not wasInitialized):
+			trace("RDESComp: Initialized")
+		elif (refresh):
+			trace("RDESComp: Origin Refresh")
+		else:
+			trace("RDESComp: Row compressed")
 
 
 	def __compressRowRDES3(self, data:list):
@@ -210,67 +475,38 @@ class RDESCompressor():
 		LVL_2_MAX = (2**12)-1 # Lvl2 = 12 bits
 		LVL_3_MAX = (2**20)-1 # Lvl3 = 20 bits
 
+		compressed = self.__compressed
+		lastVals = self.__lastVals
+
 		## Loop over each column in this row
 		for i in range(self.__numCols):
 			newVal = data[i]
-			lastVal = self.__lastVals[i]
-			if self.__verbose: print(f"RDES3: Compressing column {i}: {lastVal} -> {newVal}")
-			## Determine if adding or subtracting
-			add = (newVal >= lastVal)
-			## Determine offset
-			offset = abs(lastVal - newVal)
-			
-			## Determine how many bytes needed for storage
-			lvl = 4
-			if (offset <= LVL_1_MAX): lvl=1
-			elif (offset <= LVL_2_MAX): lvl=2
-			elif (offset <= LVL_3_MAX): lvl=3
-			
-			## Check if compression can help
-			if (lvl == 4):
-				self.__writeUint32( newVal )
-				if self.__verbose: print(f"\tWriting uncompressed 4 bytes")
+			lastVal = lastVals[i]
+			lastVals[i] = newVal
+			## Determine if adding or subtracting; Bit7 = add
+			if (newVal >= lastVal):
+				offset = newVal - lastVal
+				add = 0b01000000
 			else:
-				if self.__verbose: print(f"\tOffset = {offset} = {byte2Str(offset)} (add={add})")
-				## Generate compressed bytes
-				if (lvl == 1):
-					# Compute 1 compressed bytes
-					
-					byte1 = 0b11000000 | offset #captures D05 to D01
-					
-					if (not add): byte1 = byte1 & 0b10111111 # Set Bit7 to 0 (subtracting)
-					byte1 = byte1 & 0b11011111 # Set Bit6 to 0 (size=1)
-
-					# Write
-					self.__write1Byte(byte1)
-					if self.__verbose: print(f"\tWriting 1 compressed byte")
-
-				if (lvl == 2):
-					# Compute 2 compressed bytes
-					
-					byte1 = 0b11110000 | offset>>8 #captures D13 to D09
-					byte2 = 0b11111111 & offset #captures D08 to D01
-					
-					if (not add): byte1 = byte1 & 0b10111111 # Set Bit7 to 0 (subtracting)
-					byte1 = byte1 & 0b11101111 # Set Bit5 to 0 (size=2)
-
-					# Write
-					self.__write2Bytes(byte1, byte2)
-					if self.__verbose: print(f"\tWriting 2 compressed bytes")
-
-				elif (lvl == 3):
-					# Compute 3 compressed bytes
-					byte1 = 0b11110000 | offset>>16 #captures D20 to D17
-					byte2 = 0b11111111 & offset>>8 #captures D16 to D09
-					byte3 = 0b11111111 & offset #captures D08 to D01
-
-					if (not add): byte1 = byte1 & 0b10111111 # Set Bit7 to 0 (subtracting)
-					# Write
-					self.__write3Bytes(byte1, byte2, byte3)
-					if self.__verbose: print(f"\tWriting 3 compressed bytes")
-
-			## Record new value
-			self.__lastVals[i] = newVal
+				offset = lastVal - newVal
+				add = 0
+
+			## Write in as few bytes as possible
+			if (offset <= LVL_1_MAX):
+				# Bit8 = offset, Bit6 = 0 (size=1); captures D05 to D01
+				compressed.append(0b10000000 | add | offset)
+			elif (offset <= LVL_2_MAX):
+				# Bit6 = 1, Bit5 = 0 (size=2); captures D12 to D01
+				compressed.append(0b10100000 | add | offset>>8)
+				compressed.append(offset & 0xFF)
+			elif (offset <= LVL_3_MAX):
+				# Bit6 = 1, Bit5 = 1 (size=3); captures D20 to D01
+				compressed.append(0b10110000 | add | offset>>16)
+				compressed.append(offset>>8 & 0xFF)
+				compressed.append(offset & 0xFF)
+			else:
+				# Compression can't help; raw uint32 (Bit8 = 0)
+				compressed += (newVal & 0x7FFFFFFF).to_bytes(4, "big")
 
 
 	def __compressRowRDES2(self, data:list):
@@ -284,54 +520,35 @@ class RDESCompressor():
 		LVL_2_MAX = (2**13)-1 # Lvl2 = 13 bits
 		LVL_3_MAX = (2**21)-1 # Lvl3 = 21 bits
 
+		compressed = self.__compressed
+		lastVals = self.__lastVals
+
 		## Loop over each column in this row
 		for i in range(self.__numCols):
 			newVal = data[i]
-			lastVal = self.__lastVals[i]
-			if self.__verbose: print(f"RDES2: Compressing column {i}: {lastVal} -> {newVal}")
-			## Determine if adding or subtracting
-			add = (newVal >= lastVal)
-			## Determine offset
-			offset = abs(lastVal - newVal)
-			
-			## Determine how many bytes needed for storage
-			lvl = 4
-			if (offset <= LVL_2_MAX): lvl=2
-			elif (offset <= LVL_3_MAX): lvl=3
-			
-			## Check if compression can help
-			if (lvl == 4):
-				self.__writeUint32( newVal )
-				if self.__verbose: print(f"\tWriting uncompressed 4 bytes")
+			lastVal = lastVals[i]
+			lastVals[i] = newVal
+			## Determine if adding or subtracting; Bit7 = add
+			if (newVal >= lastVal):
+				offset = newVal - lastVal
+				add = 0b01000000
 			else:
-				if self.__verbose: print(f"\tOffset = {offset} = {byte2Str(offset)} (add={add})")
-				## Generate compressed bytes
-				if (lvl == 2):
-					# Compute 2 compressed bytes
-					
-					byte1 = 0b11100000 | offset>>8 #captures D13 to D09
-					byte2 = 0b11111111 & offset #captures D08 to D01
-					
-					if (not add): byte1 = byte1 & 0b10111111 # Set Bit7 to 0 (subtracting)
-					byte1 = byte1 & 0b11011111 # Set Bit6 to 0 (size=2)
-
-					# Write
-					self.__write2Bytes(byte1, byte2)
-					if self.__verbose: print(f"\tWriting 2 compressed bytes")
-				
-				elif (lvl == 3):
-					# Compute 3 compressed bytes
-					byte1 = 0b11100000 | offset>>16 #captures D21 to D17
-					byte2 = 0b11111111 & offset>>8 #captures D16 to D09
-					byte3 = 0b11111111 & offset #captures D08 to D01
-
-					if (not add): byte1 = byte1 & 0b10111111 # Set Bit7 to 0 (subtracting)
-					# Write
-					self.__write3Bytes(byte1, byte2, byte3)
-					if self.__verbose: print(f"\tWriting 3 compressed bytes")
-				
-			## Record new value
-			self.__lastVals[i] = newVal
+				offset = lastVal - newVal
+				add = 0
+
+			## Write in as few bytes as possible
+			if (offset <= LVL_2_MAX):
+				# Bit8 = offset, Bit6 = 0 (size=2); captures D13 to D01
+				compressed.append(0b10000000 | add | offset>>8)
+				compressed.append(offset & 0xFF)
+			elif (offset <= LVL_3_MAX):
+				# Bit6 = 1 (size=3); captures D21 to D01
+				compressed.append(0b10100000 | add | offset>>16)
+				compressed.append(offset>>8 & 0xFF)
+				compressed.append(offset & 0xFF)
+			else:
+				# Compression can't help; raw uint32 (Bit8 = 0)
+				compressed += (newVal & 0x7FFFFFFF).to_bytes(4, "big")
 
 
 	def __compressRowRDES1(self, data:list):
@@ -344,39 +561,119 @@ class RDESCompressor():
 
 		LVL_3_MAX = (2**22)-1 # Lvl3 = 22 bits
 
+		compressed = self.__compressed
+		lastVals = self.__lastVals
+
 		## Loop over each column in this row
 		for i in range(self.__numCols):
 			newVal = data[i]
-			lastVal = self.__lastVals[i]
-			if self.__verbose: print(f"RDES1: Compressing column {i}: {lastVal} -> {newVal}")
-			## Determine if adding or subtracting
-			add = (newVal >= lastVal)
-			## Determine offset
-			offset = abs(lastVal - newVal)
-			
-			## Determine how many bytes needed for storage
-			lvl = 4
-			if (offset <= LVL_3_MAX): lvl=3
-
-			## Check if compression can help
-			if (lvl == 4):
-				self.__writeUint32( newVal )
-				if self.__verbose: print(f"\tWriting uncompressed 4 bytes")
+			lastVal = lastVals[i]
+			lastVals[i] = newVal
+			## Determine if adding or subtracting; Bit7 = add
+			if (newVal >= lastVal):
+				offset = newVal - lastVal
+				add = 0b01000000
 			else:
-				if self.__verbose: print(f"\tOffset = {offset} = {byte2Str(offset)} (add={add})")
-				## Generate 3 compressed bytes
-	
-				byte1 = 0b11000000 | offset>>16 #captures D22 to D17
-				byte2 = 0b11111111 & offset>>8 #captures D16 to D09
-				byte3 = 0b11111111 & offset #captures D08 to D01
+				offset = lastVal - newVal
+				add = 0
+
+			if (offset <= LVL_3_MAX):
+				# Bit8 = offset; captures D22 to D01
+				compressed.append(0b10000000 | add | offset>>16)
+				compressed.append(offset>>8 & 0xFF)
+				compressed.append(offset & 0xFF)
+			else:
+				# Compression can't help; raw uint32 (Bit8 = 0)
+				compressed += (newVal & 0x7FFFFFFF).to_bytes(4, "big")
 
-				if (not add): byte1 = byte1 & 0b10111111 # Set Bit7 to 0 (subtracting)
-				# Write
-				self.__write3Bytes(byte1, byte2, byte3)
-				if self.__verbose: print(f"\tWriting 3 compressed bytes")
+	def __writeRowPacked(self, data:list):
+		"""
+		RDES4. Buffers the given row; every blockRows rows are
+		written as one block (see __writePackedBlock()).
 
-			## Record new value
-			self.__lastVals[i] = newVal
+		Raises a ValueError (buffering nothing) if a value does not
+		fit in 31 bits.
+		"""
+		if (min(data) < 0 or max(data) > 0x7FFFFFFF):
+			raise ValueError("RDES4 values must fit in 31 bits; use unsignify() for signed values")
+		self.__rowsCompressed += 1
+		pending = self.__pendingRows
+		stats = self.__stats
+		if (stats is not None):
+			if (pending):
+				stats.recordRow(pending[-1], data)
+			else:
+				stats.recordRawRow() # First row of a block is stored whole
+			## Bytes & time are counted when the block is sealed
+			stats.recordEncode(1, 0, 0)
+		pending.append(list(data))
+		if (len(pending) >= self.__blockRows):
+			self.__writePackedBlock()
+
+
+	def __writePackedBlock(self):
+		"""
+		RDES4. Writes the buffered rows as one block, column by column.
+
+		For each column, the block stores its first value, then the
+		deltas between consecutive values, minus their minimum (the
+		frame of reference), packed at a single bit width (LSB-first,
+		padded to a multiple of 8 deltas, so every 8 deltas take
+		exactly width bytes). The width minimizing the column's size
+		is chosen; deltas that do not fit are stored separately as
+		(index, value) exceptions. Blocks do not depend on each other.
+		"""
+		stats = self.__stats
+		start = perf_counter() if (stats is not None) else 0
+		rows = self.__pendingRows
+		self.__pendingRows = []
+		columns = [list(vals) for vals in zip(*rows)]
+		trace = self.__trace
+		compressed = self.__compressed
+		sizeBefore = len(compressed)
+		compressed += PACKED_BLOCK_HEADER.pack(len(rows))
+		numDeltas = len(rows) - 1
+		groups = -(-numDeltas // 8)
+
+		for col, vals in enumerate(columns):
+			deltas = [b - a for a, b in zip(vals, vals[1:])]
+			ref = min(deltas) if deltas else 0
+			deltas = [delta - ref for delta in deltas]
+
+			## Pick the cheapest width; wider deltas become exceptions
+			widthCounts = [0]*34
+			for delta in deltas:
+				widthCounts[delta.bit_length()] += 1
+			width = 0
+			exceptions = numDeltas - widthCounts[0]
+			bestSize = exceptions * PACKED_EXCEPTION.size
+			remaining = exceptions
+			for bits in range(1, 34):
+				remaining -= widthCounts[bits]
+				size = groups*bits + remaining*PACKED_EXCEPTION.size
+				if (size < bestSize):
+					width, bestSize, exceptions = bits, size, remaining
+
+			compressed += PACKED_COLUMN_HEADER.pack(vals[0], ref, width, exceptions)
+			## Pack 64 deltas (8*width bytes) at a time
+			limit = 1 << width
+			if (width):
+				for start in range(0, numDeltas, 64):
+					packed = 0
+					shift = 0
+					for delta in deltas[start:start+64]:
+						if (delta < limit): packed |= delta << shift
+						shift += width
+					compressed += packed.to_bytes(-(-min(64, numDeltas - start) // 8) * width, "little")
+			for index, delta in enumerate(deltas):
+				if (delta >= limit):
+					compressed += PACKED_EXCEPTION.pack(index, delta)
+
+			if (trace is not None):
+				trace(f"RDES4: Block of {len(rows)} rows, column {col}: first={vals[0]}, ref={ref}, width={width}, exceptions={exceptions}")
+
+		if (stats is not None):
+			stats.recordEncode(0, len(compressed) - sizeBefore, perf_counter() - start)
 
 
 
@@ -387,7 +684,13 @@ class RDESDecompressor():
 	or provide the column indexes (start=0) to have them
 	automatically re-signed.
 
-	Supports RDES variants: RDES1, RDES2, RDES3
+	Supports RDES variants: RDES1, RDES2, RDES3, RDES4 (bit-packed)
+
+	Pass an RDESStats object (see rdesStats.py) to accumulate
+	decode timing counters; disabled by default.
+
+	Pass a trace hook (any callable accepting a string) to receive
+	bit-level debug output; verbose=True is shorthand for trace=print.
 
 	Requires the entire compressed dataset to function.
 
@@ -398,22 +701,31 @@ class RDESDecompressor():
 	or else decompressed data will be corrupted!
 	"""
 
-	def __init__(self, variant:int=1, numCols:int=3, verbose:bool=False, signedCols=[]):
+	def __init__(self, variant:int=1, numCols:int=3, verbose:bool=False, signedCols=[], stats=None, trace=None):
 		# The RDES variant
 		self.__variant = variant
 		# Number of columns in the virtual table
 		self.__numCols = numCols
-		# If debug data should be printed to the console
-		self.__verbose = verbose
+		# Optional trace hook; receives debug strings (verbose = print)
+		self.__trace = print if (verbose and trace is None) else trace
+		# Decode loop; only the traced loop carries debug code
+		if (variant == PACKED_VARIANT):
+			self.__decoder = self.__decodePackedInto
+		else:
+			self.__decoder = self.__decodeInto if (self.__trace is None) else self.__decodeIntoTraced
 		# Index of columns that contain signed data
 		self.__signedCols = signedCols
+		# Optional RDESStats counters (None = disabled)
+		self.__stats = stats
 
 		# Current column waiting for a value
 		self.__curCol = 0
 		# The most recent decoded values for each column
 		self.__lastDecodedVals = [0]*self.__numCols
-		# A copy of the most recent set of decompressed data
-		self.__lastDecompressed = []
+		# Values of a row left unfinished by the previous input
+		self.__pendingVals = []
+		# Number of rows in the most recent decompressed data
+		self.__lastRowCount = 0
 		# The size of the last compressed input (bytes)
 		self.__lastCompressedSize = 0
 
@@ -425,7 +737,7 @@ class RDESDecompressor():
 		"""
 		# values = rows * cols
 		# uint32 = 4 bytes
-		return len(self.__lastDecompressed) * self.__numCols * 4
+		return self.__lastRowCount * self.__numCols * 4
 
 
 	def getCompressedSize(self):
@@ -444,6 +756,44 @@ class RDESDecompressor():
 		return self.getUncompressedSize() / self.getCompressedSize()
 
 
+	def getStats(self):
+		"""
+		Returns the RDESStats object collecting counters
+		for this decompressor, or None if disabled.
+		"""
+		return self.__stats
+
+
+	def getState(self):
+		"""
+		Returns a compact checkpoint (bytes) of the decompressor's
+		chain state: the last decoded values, and any unfinished row.
+
+		Restoring it (see restoreState()) lets a new decompressor
+		continue decoding data appended to an already-decoded stream.
+		"""
+		numCols = self.__numCols
+		curCol = self.__curCol
+		pending = (self.__pendingVals + [0]*numCols)[:curCol]
+		header = DECO_STATE_HEADER.pack(STATE_MAGIC, b"D", STATE_VERSION, self.__variant, numCols, curCol)
+		return header + struct.pack(f"<{numCols + curCol}q", *self.__lastDecodedVals, *pending)
+
+
+	def restoreState(self, state):
+		"""
+		Restores a checkpoint produced by getState().
+		Variant & column count must match.
+		"""
+		numCols = self.__numCols
+		fields, values = _unpackState(state, DECO_STATE_HEADER, b"D", self.__variant, numCols)
+		curCol = fields[5]
+		if (curCol >= numCols or len(values) != numCols + curCol):
+			raise ValueError("RDES state is truncated")
+		self.__curCol = curCol
+		self.__lastDecodedVals = list(values[:numCols])
+		self.__pendingVals = list(values[numCols:])
+
+
 	def resignify(self, inp):
 		"""
 		Converts an encoded signed value (unsigned) to a
@@ -480,7 +830,7 @@ class RDESDecompressor():
 		byte of an RDES3-encoded offset value (eliminates
 		flag bits).
 		"""
-		if (checkBit(byte1, 6) == 1):
+		if (byte1 & 0b00100000): # Bit6
 			# 2 or 3 bytes; 4 value bits
 			return byte1 & 0b00001111
 		else:
@@ -493,21 +843,266 @@ class RDESDecompressor():
 		Decompresses the provided data and returns the original data.
 
 		In format of list of lists, with each sub-list representing a row.
+
+		Accepts a list of byte values, or any object supporting the
+		buffer protocol (bytes, bytearray, memoryview, mmap, NumPy
+		uint8 array); buffers are read in place, never copied.
 		"""
-		## Make temp variables
-		decodedRows = []
-		curRowVals = [0]*self.__numCols
-		## Cache size
-		self.__lastCompressedSize = len(bytes)
+		bytes = self.__asByteSequence(bytes)
+		## Fast path when not collecting stats
+		stats = self.__stats
+		if (stats is None):
+			return self.__decompress(bytes)
+
+		## Time the decode
+		start = perf_counter()
+		decodedRows = self.__decompress(bytes)
+		stats.recordDecode(len(decodedRows), len(bytes), perf_counter() - start)
+		return decodedRows
+
+
+	def decompressTable(self, bytes):
+		"""
+		Decompresses the provided data like decompress(), but returns
+		a compact RDESTable backed by a single flat array of 64-bit
+		ints (8 bytes per value) instead of a list of lists.
 
-		## Iterate until all bytes have been handled
+		The table can be indexed & iterated like the list of lists,
+		and provides per-column arrays (or a NumPy view).
+		"""
+		## Table support is loaded on first use
+		from rdesTable import RDESTable
+		from array import array
+
+		bytes = self.__asByteSequence(bytes)
+		stats = self.__stats
+		start = perf_counter() if (stats is not None) else 0
+		numCols = self.__numCols
+		size = len(bytes)
+		self.__lastCompressedSize = size
+
+		## Decode in fixed-size chunks, following any unfinished row
+		values = array("q", (self.__pendingVals + [0]*numCols)[:self.__curCol])
+		chunk = array("q", [0]) * min(max(size, 1), 65536)
 		i = 0
+		while (i < size):
+			end, consumed = self.__decoder(bytes, chunk, 0, i)
+			if (consumed == i):
+				chunk.extend(chunk) # Packed (RDES4) block larger than the chunk
+			values.extend(chunk[:end])
+			i = consumed
+
+		## Trim to complete rows
+		complete = len(values) - (len(values) % numCols)
+		self.__pendingVals = values[complete:].tolist()
+		del values[complete:]
+
+		table = RDESTable(values, numCols)
+		self.__lastRowCount = len(table)
+		if (stats is not None):
+			stats.recordDecode(len(table), size, perf_counter() - start)
+		return table
+
+
+	def decompressInto(self, bytes, out, pos:int=0):
+		"""
+		Decompresses the provided data directly into a caller-provided
+		writable integer buffer (array.array('l'), NumPy int64 array,
+		shared memory memoryview, ...), row-major, starting at index pos.
+		No intermediate Python lists are built.
+
+		If the data does not end on a row boundary, the values of
+		the incomplete row are still written; decoding continues with
+		the next column on the following call (of any decode method;
+		decompress() then returns the whole row).
+
+		Returns the index after the last value written. Raises a
+		ValueError if out is too small, or an IndexError if the
+		data is truncated.
+		"""
+		end, consumed = self.decompressPartial(bytes, out, pos)
+		if (consumed < len(bytes)):
+			raise ValueError(f"Output buffer too small; decoded {consumed} of {len(bytes)} bytes")
+		return end
+
+
+	def decompressPartial(self, bytes, out, pos:int=0, start:int=0):
+		"""
+		Decompresses the provided data from byte index start onward
+		into out (like decompressInto()), stopping early once out is
+		full. Decoding can then be continued from the returned byte
+		index, e.g. to split a stream into fixed-size blocks.
+
+		Returns (index after the last value written in out,
+		index of the first byte not yet decoded).
+
+		RDES4 blocks are decoded whole, so out must have room for at
+		least one block; a block which does not fit is left for the
+		next call.
+		"""
+		bytes = self.__asByteSequence(bytes)
+		out = self.__asIntView(out)
+		stats = self.__stats
+		startTime = perf_counter() if (stats is not None) else 0
+
+		self.__lastCompressedSize = len(bytes)
+		startCol = self.__curCol
+		pending = (self.__pendingVals + [0]*self.__numCols)[:startCol]
+		end, consumed = self.__decoder(bytes, out, pos, start)
+		if (consumed == start and start < len(bytes) and pos < len(out)):
+			raise ValueError("Output buffer smaller than an RDES4 block")
+
+		## Keep the values of an unfinished row, so that any entry
+		## point can continue it (it may have begun in an earlier call)
+		curCol = self.__curCol
+		if (curCol <= end - pos):
+			self.__pendingVals = list(out[end-curCol:end])
+		else:
+			self.__pendingVals = pending + list(out[pos:end])
+
+		self.__lastRowCount = (end - pos) // self.__numCols
+		if (stats is not None):
+			stats.recordDecode(self.__lastRowCount, consumed - start, perf_counter() - startTime)
+		return end, consumed
+
+
+	def __asByteSequence(self, data):
+		"""
+		Returns an indexable view of the given compressed data;
+		buffer-protocol objects are wrapped in a flat byte memoryview
+		(so that e.g. NumPy scalars never reach the decode loop).
+		"""
+		if (isinstance(data, (bytes, bytearray, list, tuple))):
+			return data
+		## A flat byte view is used as-is, so the caller can release it
+		if (isinstance(data, memoryview) and data.ndim == 1 and data.format == "B"):
+			return data
+		try:
+			view = memoryview(data)
+		except TypeError:
+			return data # Plain sequence of ints
+		if (view.ndim != 1 or view.format != "B"):
+			view = view.cast("B")
+		return view
+
+
+	def __asIntView(self, out):
+		"""
+		Returns a flat, writable memoryview of the given
+		integer output buffer.
+		"""
+		view = memoryview(out)
+		if (view.readonly):
+			raise ValueError("Output buffer must be writable")
+		if (view.ndim != 1):
+			view = view.cast("B").cast(view.format)
+		return view
+
+
+	def __decompress(self, bytes):
+		"""
+		Decompresses the provided data; see decompress().
+		"""
+		numCols = self.__numCols
+		self.__lastCompressedSize = len(bytes)
+
+		## Decode into a flat list, following any unfinished row
+		## (every value takes at least 1 byte)
+		pending = (self.__pendingVals + [0]*numCols)[:self.__curCol]
+		flat = pending + [0]*len(bytes)
+		end, i = self.__decoder(bytes, flat, len(pending))
+		## Packed (RDES4) blocks can hold more values than bytes
 		while (i < len(bytes)):
+			flat.extend([0]*len(flat))
+			end, i = self.__decoder(bytes, flat, end, i)
+
+		## Split into rows
+		complete = end - (end % numCols)
+		self.__pendingVals = flat[complete:end]
+		decodedRows = [flat[k:k+numCols] for k in range(0, complete, numCols)]
+		self.__lastRowCount = len(decodedRows)
+		return decodedRows
+
+
+	def __decodeInto(self, bytes, out, pos, i=0):
+		"""
+		Decodes the values in the provided data from byte index i
+		onward, writing them to out[pos], out[pos+1], ... until
+		either runs out.
+
+		Returns (index after the last value written, index of
+		the first byte not yet decoded).
+
+		The hot loop; bit tests are inlined and there is no debug
+		code. __decodeIntoTraced() is the readable equivalent.
+		"""
+		## Hoist state into locals
+		variant = self.__variant
+		numCols = self.__numCols
+		lastVals = self.__lastDecodedVals
+		signOffset = ((2**30)-1)//2
+		signed = [(col in self.__signedCols) for col in range(numCols)]
+		curCol = self.__curCol
+		size = len(bytes)
+		limit = len(out)
+
+		while (i < size and pos < limit):
 			byte1 = bytes[i]
-			if self.__verbose: print(f"RDESDeco: Processing byte #{i+1}; {byte2Str(byte1)}")
+			if (byte1 & 0b10000000): # Offset value
+				if (variant == 3):
+					if (byte1 & 0b00100000):
+						if (byte1 & 0b00010000):
+							offset = ((byte1 & 0b00001111)<<16) | (bytes[i+1]<<8) | bytes[i+2]
+							i += 3
+						else:
+							offset = ((byte1 & 0b00001111)<<8) | bytes[i+1]
+							i += 2
+					else:
+						offset = byte1 & 0b00011111
+						i += 1
+				elif (variant == 2):
+					if (byte1 & 0b00100000):
+						offset = ((byte1 & 0b00011111)<<16) | (bytes[i+1]<<8) | bytes[i+2]
+						i += 3
+					else:
+						offset = ((byte1 & 0b00011111)<<8) | bytes[i+1]
+						i += 2
+				else:
+					offset = ((byte1 & 0b00111111)<<16) | (bytes[i+1]<<8) | bytes[i+2]
+					i += 3
+				if (byte1 & 0b01000000):
+					storedVal = lastVals[curCol] + offset
+				else:
+					storedVal = lastVals[curCol] - offset
+			else: # Raw uint32
+				storedVal = (byte1<<24) | (bytes[i+1]<<16) | (bytes[i+2]<<8) | bytes[i+3]
+				i += 4
+
+			lastVals[curCol] = storedVal
+			out[pos] = (storedVal - signOffset) if signed[curCol] else storedVal
+			pos += 1
+			curCol += 1
+			if (curCol == numCols):
+				curCol = 0
+
+		self.__curCol = curCol
+		return pos, i
+
+
+	def __decodeIntoTraced(self, bytes, out, pos, i=0):
+		"""
+		Decodes the provided data like __decodeInto(),
+		reporting each step to the trace hook.
+		"""
+		trace = self.__trace
+
+		## Iterate until all bytes have been handled (or out is full)
+		while (i < len(bytes) and pos < len(out)):
+			byte1 = bytes[i]
+			trace(f"RDESDeco: Processing byte #{i+1}; {byte2Str(byte1)}")
 
 			## Decode next value
-			if (checkBit(byte1, 8) == 1): # Offset value found - decode
+			if (byte1 & 0b10000000): # Bit8; offset value found - decode
 				## Determine origin of offset
 				refVal = self.__lastDecodedVals[self.__curCol]
 
@@ -517,12 +1112,12 @@ class RDESDecompressor():
 					size = 3
 				elif (self.__variant == 2):
 					# 2 or 3
-					size = 3 if checkBit(byte1, 6) else 2
+					size = 3 if (byte1 & 0b00100000) else 2 # Bit6
 				else:
 					# 1, 2, or 3
 					size = 1
-					if (checkBit(byte1, 6) == 1):
-						size = 3 if checkBit(byte1, 5) else 2
+					if (byte1 & 0b00100000): # Bit6
+						size = 3 if (byte1 & 0b00010000) else 2 # Bit5
 
 				## Decode offset value
 				if (size == 1):
@@ -552,13 +1147,13 @@ class RDESDecompressor():
 				i += size #move cursor forward
 
 				## Determine offset sign
-				add = checkBit(byte1, 7) #B07; 1=add, 0=sub
+				add = byte1 & 0b01000000 #B07; 1=add, 0=sub
 				if (not add): offset *= -1
 
 				## Calculate value
 				decodedVal = refVal + offset
 
-				if self.__verbose: print(f"\tDecoded offset = {offset}, size={size}B -> {refVal} + {offset} = {decodedVal}")
+				trace(f"\tDecoded offset = {offset}, size={size}B -> {refVal} + {offset} = {decodedVal}")
 
 			else: # Raw uint32 found - decode
 				## Isolate bytes
@@ -574,27 +1169,113 @@ class RDESDecompressor():
 			if (self.__curCol in self.__signedCols):
 				decodedVal = self.resignify(decodedVal)
 
-			if self.__verbose: print(f"\tDecoded raw value = {decodedVal}")
+			trace(f"\tDecoded raw value = {decodedVal}")
 
-			## Value decoded; store in row
-			curRowVals[self.__curCol] = decodedVal
+			## Value decoded; store in output
+			out[pos] = decodedVal
+			pos += 1
 			self.__lastDecodedVals[self.__curCol] = storedVal #need stored value, not resignified one
 			self.__curCol += 1
 
 			## Move to next row if done
 			if (self.__curCol == self.__numCols):
 				self.__curCol = 0
-				decodedRows.append(curRowVals)
-				curRowVals = [0]*self.__numCols
+				trace("RDESDeco: Row decoded")
 
-		## Return decompressed data
-		self.__lastDecompressed = decodedRows
-		return decodedRows
+		return pos, i
 
+	def __decodePackedInto(self, bytes, out, pos, i=0):
+		"""
+		RDES4. Decodes whole blocks (see
+		RDESCompressor.__writePackedBlock()) from byte index i onward
+		into out[pos], out[pos+1], ... while they fit.
+
+		Each column is unpacked 64 deltas at a time from a single
+		integer, then patched & prefix-summed in bulk.
 
-## Demo
+		Returns (index after the last value written, index of
+		the first byte not yet decoded).
+		"""
+		from itertools import accumulate
+		from array import array
+
+		if (isinstance(bytes, (list, tuple))):
+			bytes = bytearray(bytes)
+		numCols = self.__numCols
+		signOffset = ((2**30)-1)//2
+		signedCols = self.__signedCols
+		trace = self.__trace
+		size = len(bytes)
+		limit = len(out)
+		blockHeader = PACKED_BLOCK_HEADER.size
+		colHeader = PACKED_COLUMN_HEADER.size
+		excSize = PACKED_EXCEPTION.size
+
+		while (i < size):
+			if (i + blockHeader > size):
+				raise IndexError("Truncated RDES4 block")
+			rows = PACKED_BLOCK_HEADER.unpack_from(bytes, i)[0]
+			if (pos + rows*numCols > limit):
+				break # Left for the next call
+			j = i + blockHeader
+			numDeltas = max(rows - 1, 0)
+			groups = -(-numDeltas // 8)
+			block = [0]*(rows*numCols)
+
+			for col in range(numCols):
+				if (j + colHeader > size):
+					raise IndexError("Truncated RDES4 block")
+				first, ref, width, exceptions = PACKED_COLUMN_HEADER.unpack_from(bytes, j)
+				j += colHeader
+				if (width > 32):
+					raise ValueError(f"Invalid RDES4 delta width {width}")
+				packedEnd = j + groups*width
+				if (packedEnd + exceptions*excSize > size):
+					raise IndexError("Truncated RDES4 block")
+
+				## Unpack 64 deltas (8*width bytes) per integer
+				if (width):
+					mask = (1 << width) - 1
+					shifts = range(0, 64*width, width)
+					deltas = []
+					for start in range(j, packedEnd, 8*width):
+						packed = int.from_bytes(bytes[start:min(start + 8*width, packedEnd)], "little")
+						deltas.extend([(packed >> shift) & mask for shift in shifts])
+					del deltas[numDeltas:]
+				else:
+					deltas = [0]*numDeltas
+
+				## Patch exceptions, then rebuild the values
+				for index, delta in PACKED_EXCEPTION.iter_unpack(bytes[packedEnd:packedEnd + exceptions*excSize]):
+					deltas[index] = delta
+				j = packedEnd + exceptions*excSize
+				if (rows):
+					vals = list(accumulate([delta + ref for delta in deltas], initial=first))
+					if (col in signedCols):
+						vals = [val - signOffset for val in vals]
+					block[col::numCols] = vals
+				if (trace is not None):
+					trace(f"RDES4Deco: Block of {rows} rows, column {col}: first={first}, ref={ref}, width={width}, exceptions={exceptions}")
+
+			## Write the block's rows
+			if (isinstance(out, list)):
+				out[pos:pos+len(block)] = block
+			else:
+				out[pos:pos+len(block)] = array(getattr(out, "typecode", None) or out.format, block)
+			pos += len(block)
+			i = j
+
+		return pos, i
+
+
+## Command-line tool (with arguments) / demo
 if __name__ == "__main__":
 
+	import sys
+	if (len(sys.argv) > 1):
+		from rdesCli import main
+		sys.exit(main())
+
 	import random
 
 	# RDES variant
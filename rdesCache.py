@@ -0,0 +1,143 @@
+"""
+Date: Oct.19.2026
+
+Description: A memory-bounded LRU cache for decoded RDES blocks.
+"""
+
+from collections import OrderedDict
+
+
+class RDESBlockCache():
+	"""
+	A least-recently-used cache of decoded blocks, bounded by the
+	total (approximate) size of the cached values in bytes rather
+	than by entry count.
+
+	Keys are (file, block) pairs, so one cache can be shared by
+	several readers/stores; every block of a file can be dropped at
+	once with invalidateFile() (e.g. when the file is rewritten).
+
+	Tracks hit, miss, eviction & invalidation counts.
+	"""
+
+	def __init__(self, maxBytes:int=64*2**20):
+		# Size budget for all cached values (bytes)
+		self.__maxBytes = maxBytes
+		# (file, block) -> (value, size); most recently used last
+		self.__entries = OrderedDict()
+		# file -> set of cached blocks
+		self.__fileBlocks = {}
+		# Current total size of cached values (bytes)
+		self.__size = 0
+		self.resetStats()
+
+
+	def resetStats(self):
+		"""
+		Clears the hit/miss counters.
+		"""
+		self.__hits = 0
+		self.__misses = 0
+		self.__evictions = 0
+		self.__invalidations = 0
+
+
+	def get(self, file, block):
+		"""
+		Returns the cached value for the given block of a file
+		(marking it as recently used), or None if it is not cached.
+		"""
+		entry = self.__entries.get((file, block))
+		if (entry is None):
+			self.__misses += 1
+			return None
+		self.__hits += 1
+		self.__entries.move_to_end((file, block))
+		return entry[0]
+
+
+	def put(self, file, block, value, size:int):
+		"""
+		Caches a value of the given size (bytes), evicting the least
+		recently used entries until the cache fits its budget.
+
+		Values larger than the whole budget are not cached.
+		"""
+		self.__remove(file, block)
+		if (size > self.__maxBytes):
+			return
+		self.__entries[(file, block)] = (value, size)
+		self.__fileBlocks.setdefault(file, set()).add(block)
+		self.__size += size
+		while (self.__size > self.__maxBytes):
+			(oldFile, oldBlock), entry = next(iter(self.__entries.items()))
+			self.__remove(oldFile, oldBlock)
+			self.__evictions += 1
+
+
+	def __remove(self, file, block):
+		"""
+		Removes an entry if present; returns True if it was.
+		"""
+		entry = self.__entries.pop((file, block), None)
+		if (entry is None):
+			return False
+		self.__size -= entry[1]
+		blocks = self.__fileBlocks[file]
+		blocks.discard(block)
+		if (not blocks):
+			del self.__fileBlocks[file]
+		return True
+
+
+	def invalidate(self, file, block):
+		"""
+		Drops a single block of a file, if cached.
+		"""
+		if (self.__remove(file, block)):
+			self.__invalidations += 1
+
+
+	def invalidateFile(self, file):
+		"""
+		Drops every cached block of a file.
+		"""
+		for block in list(self.__fileBlocks.get(file, ())):
+			self.invalidate(file, block)
+
+
+	def clear(self):
+		"""
+		Removes every entry from the cache.
+		"""
+		self.__entries.clear()
+		self.__fileBlocks.clear()
+		self.__size = 0
+
+
+	def getSize(self):
+		"""
+		Returns the total size of the cached values, in bytes.
+		"""
+		return self.__size
+
+
+	def getStats(self):
+		"""
+		Returns the cache counters as a dictionary.
+		"""
+		lookups = self.__hits + self.__misses
+		return {
+			"entries": len(self.__entries),
+			"bytes": self.__size,
+			"maxBytes": self.__maxBytes,
+			"hits": self.__hits,
+			"misses": self.__misses,
+			"hitRatio": (self.__hits / lookups) if lookups else 0.0,
+			"evictions": self.__evictions,
+			"invalidations": self.__invalidations,
+		}
+
+
+	def __len__(self):
+		return len(self.__entries)
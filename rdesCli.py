@@ -0,0 +1,537 @@
+"""
+Date: Oct.19.2026
+
+Description: Command-line tool for bulk compression, decompression and
+			 inspection of RDES files. Run "python rdes.py --help".
+"""
+
+from rdes import RDESCompressor, RDESDecompressor
+from rdesStats import RDESStats
+from concurrent.futures import ProcessPoolExecutor
+from array import array
+import argparse
+import struct
+import mmap
+import json
+import ast
+import csv
+import sys
+import os
+
+
+## Sidecar metadata written next to every compressed file
+META_SUFFIX = ".json"
+META_FORMAT = "rdes-cli"
+META_VERSION = 1
+
+## Supported integer dtypes -> array typecode
+DTYPES = {
+	"int8": "b", "uint8": "B",
+	"int16": "h", "uint16": "H",
+	"int32": "i", "uint32": "I",
+	"int64": "q", "uint64": "Q",
+}
+## NPY type characters (e.g. "<i4") -> dtype name
+NPY_KINDS = {"i": "int", "u": "uint"}
+
+## Header size reserved for NPY output (patched with the shape at the end)
+NPY_HEADER_SIZE = 128
+
+## Largest value RDES can store (31 bits)
+MAX_VALUE = (2**31)-1
+
+
+def _inferFormat(path, given):
+	"""
+	Returns the file format (csv / npy / raw) from the
+	argument or file extension.
+	"""
+	if (given): return given
+	ext = os.path.splitext(path)[1].lower()
+	return {".csv": "csv", ".npy": "npy"}.get(ext, "raw")
+
+
+def _parseSigned(text, numCols, signedDtype):
+	"""
+	Parses the --signed argument ("all", "none", or "0,2") into a list
+	of column indexes. Defaults to every column for signed dtypes.
+	"""
+	if (text is None):
+		return list(range(numCols)) if signedDtype else []
+	if (text == "all"):
+		return list(range(numCols))
+	if (text == "none"):
+		return []
+	return [int(col) for col in text.split(",")]
+
+
+## Readers; each returns (numCols, column names, dtype, chunk generator)
+
+def _readCsv(path, numCols, dtype, chunkRows):
+	"""
+	Reads a CSV file of integers. A non-numeric first row is
+	treated as a header of column names; every row must have
+	as many values as the first.
+	"""
+	f = open(path, newline="")
+	reader = csv.reader(f)
+	first = next(reader, None)
+	names = None
+	firstRow = None
+	if (first is not None):
+		try:
+			firstRow = [int(val) for val in first]
+		except ValueError:
+			names = first
+			firstRow = None
+		width = len(first)
+	else:
+		width = numCols or 1
+
+	def chunks():
+		with f:
+			rows = [firstRow] if (firstRow is not None) else []
+			for line in reader:
+				if (not line): continue
+				if (len(line) != width):
+					raise ValueError(f"Line {reader.line_num} has {len(line)} values; expected {width}")
+				rows.append([int(val) for val in line])
+				if (len(rows) >= chunkRows):
+					yield rows
+					rows = []
+			if (rows):
+				yield rows
+
+	return width, names, None, chunks()
+
+
+def _readNpyHeader(f):
+	"""
+	Parses an NPY header; returns (dtype name, byte order, shape).
+	"""
+	if (f.read(6) != b"\x93NUMPY"):
+		raise ValueError("Not an NPY file")
+	major = f.read(2)[0]
+	headerLen = struct.unpack("<H" if (major == 1) else "<I", f.read(2 if (major == 1) else 4))[0]
+	header = ast.literal_eval(f.read(headerLen).decode("latin1"))
+	descr = header["descr"]
+	if (header["fortran_order"]):
+		raise ValueError("Fortran-ordered NPY files are not supported")
+	if (descr[1] not in NPY_KINDS):
+		raise ValueError(f"NPY dtype {descr} is not an integer type")
+	dtype = NPY_KINDS[descr[1]] + str(int(descr[2:]) * 8)
+	return dtype, descr[0], header["shape"]
+
+
+def _readBinary(f, dtype, byteOrder, numCols, chunkRows):
+	"""
+	Yields chunks of rows from a binary stream of integers.
+	"""
+	typecode = DTYPES[dtype]
+	itemSize = array(typecode).itemsize
+	swap = (byteOrder == "<" and sys.byteorder == "big") or (byteOrder == ">" and sys.byteorder == "little")
+	with f:
+		while True:
+			raw = f.read(chunkRows * numCols * itemSize)
+			if (not raw):
+				return
+			vals = array(typecode)
+			vals.frombytes(raw[:len(raw) - len(raw) % (numCols * itemSize)])
+			if (swap): vals.byteswap()
+			vals = vals.tolist()
+			yield [vals[k:k+numCols] for k in range(0, len(vals), numCols)]
+
+
+def _readNpy(path, numCols, dtype, chunkRows):
+	"""
+	Reads a 1-D or 2-D (C-ordered) integer NPY file.
+	"""
+	f = open(path, "rb")
+	dtype, byteOrder, shape = _readNpyHeader(f)
+	width = shape[1] if (len(shape) == 2) else 1
+	return width, None, dtype, _readBinary(f, dtype, byteOrder, width, chunkRows)
+
+
+def _readRaw(path, numCols, dtype, chunkRows):
+	"""
+	Reads a headerless, native-endian binary file of integers.
+	"""
+	if (numCols is None or dtype is None):
+		raise ValueError("Raw input requires --cols and --dtype")
+	return numCols, None, dtype, _readBinary(open(path, "rb"), dtype, "=", numCols, chunkRows)
+
+
+READERS = {"csv": _readCsv, "npy": _readNpy, "raw": _readRaw}
+
+
+## Writers; write(values, count) receives a flat array of row-major values
+
+class _CsvWriter():
+	def __init__(self, path, numCols, names, dtype):
+		self.__file = open(path, "w", newline="")
+		self.__writer = csv.writer(self.__file)
+		self.__numCols = numCols
+		if (names): self.__writer.writerow(names)
+
+	def write(self, values, count):
+		numCols = self.__numCols
+		self.__writer.writerows(values[k:k+numCols].tolist() for k in range(0, count, numCols))
+
+	def close(self):
+		self.__file.close()
+
+
+class _BinaryWriter():
+	def __init__(self, path, numCols, names, dtype):
+		self.__file = open(path, "wb")
+		self.__typecode = DTYPES[dtype or "int64"]
+
+	def write(self, values, count):
+		out = values[:count] if (self.__typecode == values.typecode) else array(self.__typecode, values[:count])
+		out.tofile(self.__file)
+
+	def close(self):
+		self.__file.close()
+
+
+class _NpyWriter():
+	def __init__(self, path, numCols, names, dtype):
+		self.__file = open(path, "wb")
+		self.__numCols = numCols
+		self.__values = 0
+		self.__file.write(b"\0" * NPY_HEADER_SIZE) # Patched on close
+
+	def write(self, values, count):
+		out = values[:count]
+		if (sys.byteorder == "big"): out.byteswap()
+		out.tofile(self.__file)
+		self.__values += count
+
+	def close(self):
+		shape = (self.__values // self.__numCols, self.__numCols)
+		header = f"{{'descr': '<i8', 'fortran_order': False, 'shape': {shape}, }}"
+		header = header.ljust(NPY_HEADER_SIZE - 10 - 1) + "\n"
+		self.__file.seek(0)
+		self.__file.write(b"\x93NUMPY\x01\x00" + struct.pack("<H", len(header)) + header.encode("latin1"))
+		self.__file.close()
+
+
+WRITERS = {"csv": _CsvWriter, "npy": _NpyWriter, "raw": _BinaryWriter}
+
+
+def _checkRange(chunk, signedCols, firstRow):
+	"""
+	Raises ValueError if a (stored) value of the chunk falls outside
+	0..MAX_VALUE, naming the first offending row & column.
+	"""
+	if (min(min(row) for row in chunk) >= 0 and max(max(row) for row in chunk) <= MAX_VALUE):
+		return
+	for index, row in enumerate(chunk):
+		for col, val in enumerate(row):
+			if (col in signedCols and not 0 <= val <= MAX_VALUE):
+				raise ValueError(f"Row {firstRow + index}, column {col}: value {val - ((2**30)-1)//2} "
+					"does not fit in 31 bits after unsignify()")
+			if (val < 0):
+				raise ValueError(f"Row {firstRow + index}, column {col}: negative value {val} "
+					"in an unsigned column (see --signed)")
+			if (val > MAX_VALUE):
+				raise ValueError(f"Row {firstRow + index}, column {col}: value {val} does not fit in 31 bits")
+
+
+def compressFile(src, dst, fmt=None, variant=3, numCols=None, dtype=None, signed=None, blockRows=65536, refresh=0):
+	"""
+	Compresses an integer CSV / NPY / raw binary file into a plain
+	RDES stream, one block of rows at a time, and writes a metadata
+	sidecar (dst + ".json") with the settings, level histograms &
+	block layout.
+
+	Every value must fit in 31 bits (after unsignify() for signed
+	columns); otherwise a ValueError is raised and no output is left.
+
+	Returns the metadata dictionary.
+	"""
+	fmt = _inferFormat(src, fmt)
+	numCols, names, dtype, chunks = READERS[fmt](src, numCols, dtype, blockRows)
+	signedCols = _parseSigned(signed, numCols, dtype is not None and dtype.startswith("int"))
+
+	stats = RDESStats(variant=variant, numCols=numCols)
+	comp = RDESCompressor(variant=variant, numCols=numCols, originRefreshInterval=refresh, stats=stats)
+	blocks = []
+	rows = 0
+	try:
+		with open(dst, "wb") as out:
+			for chunk in chunks:
+				if (signedCols):
+					for row in chunk:
+						for col in signedCols:
+							row[col] = comp.unsignify(row[col])
+				_checkRange(chunk, signedCols, rows)
+				comp.writeCompressedRows(chunk)
+				data = comp.takeCompressedData()
+				blocks.append({"offset": out.tell(), "length": len(data), "rows": len(chunk)})
+				out.write(data)
+				rows += len(chunk)
+	except Exception:
+		## Leave no partial output behind
+		os.remove(dst)
+		raise
+
+	info = stats.asDict()
+	meta = {
+		"format": META_FORMAT,
+		"version": META_VERSION,
+		"variant": variant,
+		"numCols": numCols,
+		"signedCols": signedCols,
+		"columns": names,
+		"originRefreshInterval": refresh,
+		"rows": rows,
+		"uncompressedBytes": rows * numCols * 4,
+		"compressedBytes": sum(block["length"] for block in blocks),
+		"source": {"path": os.path.basename(src), "format": fmt, "dtype": dtype},
+		"rawRows": info["rawRows"],
+		"levels": [col["levels"] for col in info["columns"]],
+		"signs": [{"add": col["add"], "sub": col["sub"]} for col in info["columns"]],
+		"estimatedSizes": stats.estimateSizes(),
+		"blockRows": blockRows,
+		"blocks": blocks,
+	}
+	with open(dst + META_SUFFIX, "w") as f:
+		json.dump(meta, f, indent=1)
+	return meta
+
+
+def readMetadata(path):
+	"""
+	Returns the metadata sidecar of a compressed file, or None.
+	"""
+	try:
+		with open(path + META_SUFFIX) as f:
+			meta = json.load(f)
+	except FileNotFoundError:
+		return None
+	if (meta.get("format") != META_FORMAT):
+		raise ValueError(f"{path}{META_SUFFIX} is not RDES metadata")
+	return meta
+
+
+def decompressFile(src, dst, fmt=None, dtype=None, variant=None, numCols=None, signed=None, blockRows=65536):
+	"""
+	Decompresses a plain RDES stream into a CSV / NPY / raw binary
+	file, blockRows rows at a time (memory-mapped input).
+
+	Settings come from the metadata sidecar if present; arguments
+	override them. Returns the number of rows written.
+
+	A truncated or corrupt stream raises a ValueError, and no
+	output is left.
+	"""
+	meta = readMetadata(src) or {}
+	variant = variant or meta.get("variant")
+	numCols = numCols or meta.get("numCols")
+	if (variant is None or numCols is None):
+		raise ValueError(f"{src} has no metadata; --variant and --cols are required")
+	signedCols = meta.get("signedCols", []) if (signed is None) else _parseSigned(signed, numCols, False)
+	fmt = _inferFormat(dst, fmt)
+
+	deco = RDESDecompressor(variant=variant, numCols=numCols, signedCols=signedCols)
+	writer = WRITERS[fmt](dst, numCols, meta.get("columns"), dtype)
+	out = array("q", [0]) * (blockRows * numCols)
+	values = 0
+	try:
+		with open(src, "rb") as f:
+			size = os.fstat(f.fileno()).st_size
+			if (size > 0):
+				with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+					## Released before the mmap closes, even if decoding fails
+					view = memoryview(data)
+					try:
+						i = 0
+						while (i < size):
+							end, i = deco.decompressPartial(view, out, 0, i)
+							if (i == size and end % numCols != 0):
+								raise ValueError(f"{src} ends in the middle of a row (truncated?)")
+							writer.write(out, end)
+							values += end
+					except IndexError:
+						raise ValueError(f"{src} is truncated or corrupt") from None
+					finally:
+						view.release()
+		## Catches truncation on a row boundary
+		if ("rows" in meta and values // numCols != meta["rows"]):
+			raise ValueError(f"{src} holds {values // numCols} rows; its metadata says {meta['rows']}")
+	except Exception:
+		## Leave no partial output behind
+		writer.close()
+		os.remove(dst)
+		raise
+	writer.close()
+	return values // numCols
+
+
+def inspectFile(path, showBlocks=False):
+	"""
+	Returns a human-readable report of a compressed file, built from
+	its metadata sidecar alone (the data is not decoded).
+	"""
+	meta = readMetadata(path)
+	if (meta is None):
+		raise ValueError(f"{path} has no metadata sidecar ({path}{META_SUFFIX})")
+
+	compressed = meta["compressedBytes"]
+	ratio = (meta["uncompressedBytes"] / compressed) if compressed else 0
+	lines = [
+		f"{path}",
+		f"  RDES{meta['variant']}, {meta['numCols']} columns, {meta['rows']} rows"
+			+ (f", signed columns {meta['signedCols']}" if meta["signedCols"] else ""),
+		f"  {meta['uncompressedBytes']}B -> {compressed}B, ratio {ratio:.3f}"
+			+ (f" ({compressed/meta['uncompressedBytes']:.1%})" if meta["uncompressedBytes"] else ""),
+		f"  Raw rows: {meta['rawRows']} (origin refresh interval {meta['originRefreshInterval']})",
+	]
+
+	## Level histograms
+	names = meta["columns"] or [str(col) for col in range(meta["numCols"])]
+	lines.append("  Levels (bytes: count):")
+	for col, levels in enumerate(meta["levels"]):
+		total = sum(levels.values()) or 1
+		hist = ", ".join(f"{lvl}B: {count} ({count/total:.1%})" for lvl, count in levels.items())
+		signs = meta["signs"][col]
+		lines.append(f"    {names[col]}: {hist}; +{signs['add']} / -{signs['sub']}")
+
+	## Variant suggestion
+	sizes = {int(variant): size for variant, size in meta["estimatedSizes"].items()}
+	best = min(sizes, key=sizes.get)
+	lines.append("  Estimated size per variant: " + ", ".join(f"RDES{v}: {s}B" for v, s in sizes.items())
+		+ f" (best: RDES{best})")
+
+	## Block layout
+	blocks = meta["blocks"]
+	if (blocks):
+		lengths = [block["length"] for block in blocks]
+		lines.append(f"  Blocks: {len(blocks)} x {meta['blockRows']} rows; "
+			f"{min(lengths)}B min, {max(lengths)}B max, {sum(lengths)//len(lengths)}B avg")
+		if (showBlocks):
+			for index, block in enumerate(blocks):
+				lines.append(f"    #{index}: offset {block['offset']}, {block['length']}B, {block['rows']} rows")
+	return "\n".join(lines)
+
+
+def _defaultOutput(src, outArg, multiple, ext):
+	"""
+	Returns the output path for an input file; -o is a directory
+	when several inputs are given.
+	"""
+	if (outArg and not multiple):
+		return outArg
+	base = os.path.basename(src) if outArg else src
+	if (ext == ".rdes"):
+		name = base + ext
+	else:
+		name = (base[:-5] if base.endswith(".rdes") else base) + ext
+	return os.path.join(outArg, name) if outArg else name
+
+
+def _compressJob(job):
+	src, dst, kwargs = job
+	meta = compressFile(src, dst, **kwargs)
+	ratio = (meta["uncompressedBytes"] / meta["compressedBytes"]) if meta["compressedBytes"] else 0
+	return f"{src} -> {dst}: {meta['rows']} rows, {meta['compressedBytes']}B, ratio {ratio:.3f}"
+
+
+def _decompressJob(job):
+	src, dst, kwargs = job
+	rows = decompressFile(src, dst, **kwargs)
+	return f"{src} -> {dst}: {rows} rows"
+
+
+def _runJobs(func, jobs, numJobs):
+	"""
+	Runs jobs, in parallel processes if asked; returns
+	an exit code.
+	"""
+	failed = 0
+	if (numJobs > 1 and len(jobs) > 1):
+		with ProcessPoolExecutor(max_workers=numJobs) as pool:
+			futures = [pool.submit(func, job) for job in jobs]
+			for job, future in zip(jobs, futures):
+				try:
+					print(future.result())
+				except Exception as e:
+					print(f"{job[0]}: error: {e}", file=sys.stderr)
+					failed += 1
+	else:
+		for job in jobs:
+			try:
+				print(func(job))
+			except Exception as e:
+				print(f"{job[0]}: error: {e}", file=sys.stderr)
+				failed += 1
+	return 1 if failed else 0
+
+
+def main(argv=None):
+	"""
+	Entry point of the rdes command-line tool.
+	"""
+	parser = argparse.ArgumentParser(prog="rdes", description="Bulk RDES compression tool.")
+	sub = parser.add_subparsers(dest="command", required=True)
+
+	comp = sub.add_parser("compress", help="compress CSV / NPY / raw integer files")
+	comp.add_argument("files", nargs="+")
+	comp.add_argument("-o", "--output", help="output file (or directory for several inputs)")
+	comp.add_argument("--format", choices=list(READERS), help="input format (default: from extension)")
+	comp.add_argument("--variant", type=int, choices=[1, 2, 3, 4], default=3, help="RDES variant (4 = bit-packed)")
+	comp.add_argument("--cols", type=int, help="columns (raw input)")
+	comp.add_argument("--dtype", choices=list(DTYPES), help="integer type (raw input)")
+	comp.add_argument("--signed", help="signed columns: all, none, or e.g. 0,2 (default: all for signed dtypes)")
+	comp.add_argument("--refresh", type=int, default=0, help="origin refresh interval")
+	comp.add_argument("--block-rows", type=int, default=65536, help="rows per block (memory bound)")
+	comp.add_argument("-j", "--jobs", type=int, default=1, help="files to process in parallel")
+
+	deco = sub.add_parser("decompress", help="decompress RDES files")
+	deco.add_argument("files", nargs="+")
+	deco.add_argument("-o", "--output", help="output file (or directory for several inputs)")
+	deco.add_argument("--format", choices=list(WRITERS), default=None, help="output format (default: from extension, else csv)")
+	deco.add_argument("--dtype", choices=list(DTYPES), help="integer type (raw output, default int64)")
+	deco.add_argument("--variant", type=int, choices=[1, 2, 3, 4], help="variant (if no metadata)")
+	deco.add_argument("--cols", type=int, help="columns (if no metadata)")
+	deco.add_argument("--signed", help="signed columns (if no metadata)")
+	deco.add_argument("--block-rows", type=int, default=65536, help="rows per block (memory bound)")
+	deco.add_argument("-j", "--jobs", type=int, default=1, help="files to process in parallel")
+
+	insp = sub.add_parser("inspect", help="report levels, ratio & block layout from metadata")
+	insp.add_argument("files", nargs="+")
+	insp.add_argument("--blocks", action="store_true", help="list every block")
+	insp.add_argument("--json", action="store_true", help="print the raw metadata")
+
+	args = parser.parse_args(argv)
+	multiple = len(args.files) > 1
+
+	if (args.command == "compress"):
+		kwargs = {"fmt": args.format, "variant": args.variant, "numCols": args.cols, "dtype": args.dtype,
+			"signed": args.signed, "blockRows": args.block_rows, "refresh": args.refresh}
+		jobs = [(src, _defaultOutput(src, args.output, multiple, ".rdes"), kwargs) for src in args.files]
+		return _runJobs(_compressJob, jobs, args.jobs)
+
+	if (args.command == "decompress"):
+		ext = "." + (args.format or "csv")
+		kwargs = {"fmt": args.format, "dtype": args.dtype, "variant": args.variant, "numCols": args.cols,
+			"signed": args.signed, "blockRows": args.block_rows}
+		jobs = [(src, _defaultOutput(src, args.output, multiple, ext), kwargs) for src in args.files]
+		return _runJobs(_decompressJob, jobs, args.jobs)
+
+	failed = 0
+	for path in args.files:
+		try:
+			if (args.json):
+				print(json.dumps(readMetadata(path), indent=1))
+			else:
+				print(inspectFile(path, args.blocks))
+		except Exception as e:
+			print(f"{path}: error: {e}", file=sys.stderr)
+			failed += 1
+	return 1 if failed else 0
+
+
+if __name__ == "__main__":
+	sys.exit(main())
@@ -0,0 +1,375 @@
+"""
+Date: Oct.19.2026
+
+Description: A thread-safe, multi-producer front end for RDES; keeps one
+			 compressor per stream, sharded across worker processes.
+"""
+
+from rdes import RDESCompressor
+from array import array
+from queue import Empty
+from threading import Lock, Event
+import multiprocessing
+import pickle
+import os
+
+
+## Queue item kinds
+_ROW = 0
+_ROWS = 1
+_CALL = 2
+_STOP = 3
+
+## Requests answered by a worker (_CALL)
+_TAKE = 0
+_STATE = 1
+_KEYS = 2
+_FLUSH = 3
+
+
+def _picklable(error):
+	"""
+	Returns the exception, or a RuntimeError describing it if it
+	cannot be sent back to the parent process.
+	"""
+	try:
+		pickle.dumps(error)
+		return error
+	except Exception:
+		return RuntimeError(f"{type(error).__name__}: {error}")
+
+
+def _work(inbox, outbox, variant, numCols, originRefreshInterval, batchSize):
+	"""
+	Worker process loop for one shard; the only owner of the
+	shard's compressors.
+
+	Every _CALL is answered on outbox with (result, errors); _STOP
+	is answered with ({key: (compressed data, state)}, errors); failed
+	streams have no data or state.
+	"""
+	compressors = {}
+	errors = {}
+
+	def encode(pending):
+		## A stream which fails is recorded & skipped from then on
+		for key, segments in pending.items():
+			if (key in errors):
+				continue
+			try:
+				comp = compressors.get(key)
+				if (comp is None):
+					comp = RDESCompressor(variant=variant, numCols=numCols, originRefreshInterval=originRefreshInterval)
+					compressors[key] = comp
+				for segment in segments:
+					## Row lists encode faster than buffer slices
+					if (isinstance(segment, array)):
+						flat = segment.tolist()
+						segment = [flat[k:k+numCols] for k in range(0, len(flat), numCols)]
+					comp.writeCompressedRows(segment)
+			except Exception as e:
+				errors[key] = _picklable(e)
+
+	while True:
+		## Wait for work, then drain a batch
+		items = [inbox.get()]
+		try:
+			while (len(items) < batchSize):
+				items.append(inbox.get_nowait())
+		except Empty:
+			pass
+
+		## Group rows per stream (keeping order) into segments: lists
+		## of single rows, and the flat arrays of writeRows(); calls
+		## are answered in sequence
+		pending = {}
+		for kind, key, payload in items:
+			if (kind == _ROW):
+				segments = pending.setdefault(key, [])
+				if (not segments or not isinstance(segments[-1], list)):
+					segments.append([])
+				segments[-1].append(payload)
+			elif (kind == _ROWS):
+				pending.setdefault(key, []).append(payload)
+			else:
+				encode(pending)
+				pending = {}
+				if (kind == _STOP):
+					## Failed streams have no usable state
+					final = {key: ((bytearray(), None) if (key in errors) else (comp.takeCompressedData(), comp.getState()))
+						for key, comp in compressors.items()}
+					outbox.put((final, errors))
+					return
+				comp = None if (key in errors) else compressors.get(key)
+				if (payload == _TAKE):
+					result = comp.takeCompressedData() if (comp is not None) else bytearray()
+				elif (payload == _STATE):
+					result = comp.getState() if (comp is not None) else None
+				elif (payload == _KEYS):
+					result = list(compressors)
+				else:
+					result = None
+				outbox.put((result, errors))
+		encode(pending)
+
+
+
+class RDESShardedCompressor():
+	"""
+	Compresses many independent streams (e.g. one per device) which
+	are fed from many producer threads at once.
+
+	Each stream key gets its own RDESCompressor. Streams are sharded
+	across worker processes by key hash, so encoding runs on as many
+	cores as there are shards. Every shard has its own queue and
+	worker, which is the only owner of that shard's compressors;
+	producers of different shards never share a lock, and the rows
+	of a stream are always compressed in the order they were queued.
+
+	Workers drain their queue in batches and hand each stream's rows
+	to the bulk writeCompressedRows() path. Rows are pickled to reach
+	the workers; writeRows() sends a flat array, which is much cheaper
+	per row than writeRow().
+
+	If a stream's rows fail to compress, the error is recorded
+	against that stream alone: its later rows are dropped, and calls
+	for its key re-raise the error. Other streams are unaffected.
+
+	NOTE: Workers are started with the "forkserver" (or "spawn")
+	method, so scripts creating this must guard their entry point
+	with if __name__ == "__main__". Keys must be picklable.
+	"""
+
+	def __init__(self, variant:int=3, numCols:int=3, originRefreshInterval:int=0, numShards:int=None, batchSize:int=1024):
+		# Row width, checked before queueing
+		self.__numCols = numCols
+		# Exception raised while compressing each failed stream, by key
+		# (as last reported by its worker; re-raised on calls for that key)
+		self.__errors = {}
+		# Worker results after close(): {key: (compressed data, state)}
+		self.__final = None
+		# Set once close() has collected the worker results
+		self.__stopped = Event()
+
+		# One inbox, outbox and worker process per shard
+		numShards = numShards or os.cpu_count() or 1
+		methods = multiprocessing.get_all_start_methods()
+		context = multiprocessing.get_context("forkserver" if ("forkserver" in methods) else "spawn")
+		self.__inboxes = [context.Queue() for i in range(numShards)]
+		self.__outboxes = [context.Queue() for i in range(numShards)]
+		# Orders queueing against close(), per shard
+		self.__writeLocks = [Lock() for i in range(numShards)]
+		# Pairs each call with its answer, per shard
+		self.__callLocks = [Lock() for i in range(numShards)]
+		self.__workers = [context.Process(target=_work, daemon=True,
+			args=(self.__inboxes[i], self.__outboxes[i], variant, numCols, originRefreshInterval, batchSize))
+			for i in range(numShards)]
+		for worker in self.__workers:
+			worker.start()
+		self.__closed = False
+
+
+	def __enter__(self):
+		return self
+
+
+	def __exit__(self, *exc):
+		self.close()
+
+
+	def __shardOf(self, key):
+		"""
+		Returns the shard index which owns the given stream.
+		"""
+		return hash(key) % len(self.__inboxes)
+
+
+	def writeRow(self, key, row):
+		"""
+		Queues a row for the given stream. Thread-safe.
+
+		The row is copied, so the caller may reuse it. Raises a
+		ValueError if it does not have numCols values.
+		"""
+		self.__checkStream(key)
+		row = list(row)
+		self.__checkRow(row)
+		if (not self.__put(self.__shardOf(key), (_ROW, key, row))):
+			raise RuntimeError("RDESShardedCompressor is closed")
+
+
+	def writeRows(self, key, rows):
+		"""
+		Queues several rows for the given stream. Thread-safe.
+
+		The rows are sent as one flat array of 64-bit ints. Raises a
+		ValueError (queueing none of them) if a row does not have
+		numCols values, or if a value is not a 64-bit int.
+		"""
+		self.__checkStream(key)
+		rows = [list(row) for row in rows]
+		for row in rows:
+			self.__checkRow(row)
+		try:
+			values = array("q", [val for row in rows for val in row])
+		except (TypeError, OverflowError) as e:
+			raise ValueError(f"Rows must hold 64-bit ints: {e}") from None
+		if (not self.__put(self.__shardOf(key), (_ROWS, key, values))):
+			raise RuntimeError("RDESShardedCompressor is closed")
+
+
+	def __checkRow(self, row):
+		"""
+		Raises a ValueError if the row is not numCols wide.
+		"""
+		if (len(row) != self.__numCols):
+			raise ValueError(f"Row has {len(row)} values; expected {self.__numCols}")
+
+
+	def __put(self, shard, item):
+		"""
+		Queues an item for a shard's worker; returns False once
+		closed (never queueing behind the worker's stop).
+		"""
+		with self.__writeLocks[shard]:
+			if (self.__closed):
+				return False
+			self.__inboxes[shard].put(item)
+			return True
+
+
+	def takeCompressedData(self, key):
+		"""
+		Waits for all rows queued so far for the given stream to be
+		compressed, then returns & clears its compressed data (see
+		RDESCompressor.takeCompressedData()).
+
+		Returns: bytearray (empty for unknown streams)
+		"""
+		data = self.__call(self.__shardOf(key), _TAKE, key)
+		self.__checkStream(key)
+		return data
+
+
+	def getState(self, key):
+		"""
+		Waits for all rows queued so far for the given stream, then
+		returns its checkpoint (see RDESCompressor.getState()), or
+		None for unknown streams.
+		"""
+		state = self.__call(self.__shardOf(key), _STATE, key)
+		self.__checkStream(key)
+		return state
+
+
+	def getStreams(self):
+		"""
+		Returns the keys of all streams seen so far (after
+		waiting for queued rows).
+		"""
+		keys = []
+		for shard in range(len(self.__inboxes)):
+			keys.extend(self.__call(shard, _KEYS))
+		return keys
+
+
+	def getErrors(self):
+		"""
+		Returns {key: exception} for every stream that failed to
+		compress (after waiting for queued rows).
+		"""
+		self.flush()
+		return dict(self.__errors)
+
+
+	def flush(self):
+		"""
+		Waits until every row queued so far has been compressed.
+		"""
+		for shard in range(len(self.__inboxes)):
+			self.__call(shard, _FLUSH)
+
+
+	def close(self):
+		"""
+		Compresses any remaining rows and stops the workers.
+		Compressed data can still be taken afterwards; see
+		getErrors() for streams which failed. Rows queued after
+		(or during) close() raise a RuntimeError.
+		"""
+		for lock in self.__writeLocks:
+			lock.acquire()
+		try:
+			if (self.__closed):
+				self.__stopped.wait()
+				return
+			self.__closed = True
+			for inbox in self.__inboxes:
+				inbox.put((_STOP, None, None))
+		finally:
+			for lock in self.__writeLocks:
+				lock.release()
+
+		final = {}
+		for shard, worker in enumerate(self.__workers):
+			with self.__callLocks[shard]:
+				results, errors = self.__receive(shard)
+			final.update(results)
+			self.__errors.update(errors)
+			worker.join()
+		self.__final = final
+		self.__stopped.set()
+
+
+	def __checkStream(self, key):
+		"""
+		Re-raises the error of the given stream, if it failed.
+		"""
+		error = self.__errors.get(key)
+		if (error is not None):
+			raise error
+
+
+	def __call(self, shard, request, key=None):
+		"""
+		Has the given shard's worker answer a request, after
+		everything already queued there, and returns the result.
+		"""
+		with self.__callLocks[shard]:
+			queued = self.__put(shard, (_CALL, key, request))
+			if (queued):
+				result, errors = self.__receive(shard)
+		if (not queued):
+			return self.__answerClosed(shard, request, key)
+		self.__errors.update(errors)
+		return result
+
+
+	def __receive(self, shard):
+		"""
+		Waits for the next answer from a shard's worker; raises
+		if the worker has died.
+		"""
+		while True:
+			try:
+				return self.__outboxes[shard].get(timeout=1)
+			except Empty:
+				if (not self.__workers[shard].is_alive()):
+					raise RuntimeError(f"RDESShardedCompressor worker {shard} exited (code {self.__workers[shard].exitcode})")
+
+
+	def __answerClosed(self, shard, request, key):
+		"""
+		Answers a request from the results collected by close().
+		"""
+		self.__stopped.wait()
+		final = self.__final
+		if (request == _TAKE):
+			data, state = final.get(key, (bytearray(), None))
+			final[key] = (bytearray(), state)
+			return data
+		if (request == _STATE):
+			return final.get(key, (None, None))[1]
+		if (request == _KEYS):
+			return [key for key in final if (self.__shardOf(key) == shard)]
+		return None
@@ -0,0 +1,137 @@
+"""
+Date: Oct.19.2026
+
+Description: pandas / Apache Arrow adapters for RDES. Neither library is
+			 required until one of these functions is used.
+"""
+
+from rdes import RDESCompressor, RDESDecompressor
+from array import array
+
+
+## Offset added by RDESCompressor.unsignify()
+SIGN_OFFSET = ((2**30)-1)//2
+## Largest value RDES can store (31 bits)
+MAX_VALUE = (2**31)-1
+
+
+def _isArrow(frame):
+	"""
+	Returns True for Arrow RecordBatches/Tables, False for
+	pandas DataFrames.
+	"""
+	return hasattr(frame, "schema") and not hasattr(frame, "dtypes")
+
+
+def getSignedCols(frame):
+	"""
+	Returns the indexes of the signed integer columns of a pandas
+	DataFrame or Arrow RecordBatch/Table, for use as signedCols.
+
+	Raises ValueError if a column is not an integer column.
+	"""
+	if (_isArrow(frame)):
+		import pyarrow
+		kinds = ["i" if pyarrow.types.is_signed_integer(t) else "u" if pyarrow.types.is_unsigned_integer(t) else None
+			for t in frame.schema.types]
+		names = frame.schema.names
+	else:
+		kinds = [dtype.kind for dtype in frame.dtypes]
+		names = list(frame.columns)
+	for name, kind in zip(names, kinds):
+		if (kind not in ("i", "u")):
+			raise ValueError(f"Column {name!r} is not an integer column")
+	return [col for col, kind in enumerate(kinds) if kind == "i"]
+
+
+def _checkRange(low, high):
+	"""
+	Raises ValueError if stored values fall outside 0..MAX_VALUE.
+	"""
+	if (low is not None and (low < 0 or high > MAX_VALUE)):
+		raise ValueError("Values do not fit in 31 bits (after unsignify() for signed columns)")
+
+
+def _pandasValues(frame, signedCols):
+	"""
+	Returns the frame's values as one contiguous row-major int64
+	NumPy array, with signed columns unsignified.
+	"""
+	import numpy
+	values = numpy.array(frame.to_numpy(dtype=numpy.int64), dtype=numpy.int64, order="C", copy=True)
+	if (signedCols):
+		values[:, signedCols] += SIGN_OFFSET
+	if (values.size):
+		_checkRange(int(values.min()), int(values.max()))
+	return values
+
+
+def _arrowValues(frame, signedCols):
+	"""
+	Returns the batch's values as one contiguous row-major
+	array.array('q'), with signed columns unsignified.
+	"""
+	import pyarrow
+	import pyarrow.compute as pc
+	numCols = frame.num_columns
+	values = array("q", [0]) * (frame.num_rows * numCols)
+	for col in range(numCols):
+		column = frame.column(col)
+		if (column.null_count):
+			raise ValueError(f"Column {frame.schema.names[col]!r} contains nulls")
+		column = pc.cast(column, pyarrow.int64())
+		if (col in signedCols):
+			column = pc.add(column, SIGN_OFFSET)
+		bounds = pc.min_max(column)
+		_checkRange(bounds["min"].as_py(), bounds["max"].as_py())
+		## Chunks (Tables) are interleaved one after another
+		row = 0
+		for chunk in getattr(column, "chunks", [column]):
+			data = array("q")
+			data.frombytes(chunk.buffers()[1])
+			data = data[chunk.offset:chunk.offset+len(chunk)]
+			values[(row*numCols)+col:((row+len(chunk))*numCols):numCols] = data
+			row += len(chunk)
+	return values
+
+
+def compressFrame(comp:RDESCompressor, frame, signedCols:list=None):
+	"""
+	Compresses every row of a pandas DataFrame or Arrow
+	RecordBatch/Table of integer columns into the given compressor,
+	whose numCols must match the number of columns.
+
+	The values are gathered into one contiguous row-major buffer,
+	which is fed to writeCompressedRows(). Signed integer columns are
+	unsignified automatically (see getSignedCols()) unless signedCols
+	is given; use the same list as the decompressor's signedCols.
+
+	Returns: The list of signed column indexes used
+	"""
+	numCols = frame.num_columns if _isArrow(frame) else len(frame.columns)
+	if (numCols != comp.getNumCols()):
+		raise ValueError(f"Frame has {numCols} columns; the compressor expects {comp.getNumCols()}")
+	if (signedCols is None):
+		signedCols = getSignedCols(frame)
+	if (_isArrow(frame)):
+		values = _arrowValues(frame, signedCols)
+	else:
+		values = _pandasValues(frame, signedCols)
+	comp.writeCompressedRows(values)
+	return signedCols
+
+
+def decompressFrame(deco:RDESDecompressor, bytes, names:list=None):
+	"""
+	Decompresses bytes straight into a pandas DataFrame of int64
+	columns (see RDESTable.toPandas()).
+	"""
+	return deco.decompressTable(bytes).toPandas(names)
+
+
+def decompressBatch(deco:RDESDecompressor, bytes, names:list=None):
+	"""
+	Decompresses bytes straight into an Apache Arrow RecordBatch of
+	int64 columns (see RDESTable.toArrow()).
+	"""
+	return deco.decompressTable(bytes).toArrow(names)
@@ -0,0 +1,1027 @@
+"""
+Date: Oct.19.2026
+
+Description: Randomized differential testing of every RDES encode/decode
+			 path against a small reference codec written from the bit
+			 layouts in the README. Run "python rdesFuzz.py --help".
+"""
+
+from rdes import RDESCompressor, RDESDecompressor
+from rdesStats import RDESStats, LEVEL_BITS
+from array import array
+import tempfile
+import argparse
+import struct
+import random
+import csv
+import sys
+import os
+
+
+## Offset applied by unsignify() / resignify()
+SIGN_OFFSET = ((2**30)-1)//2
+## Largest storable value (31 bits)
+MAX_VALUE = (2**31)-1
+## Size flag bits (Bit6 / Bit5) of the first byte, per variant & level
+LEVEL_FLAGS = {1: {3: 0x00}, 2: {2: 0x00, 3: 0x20}, 3: {1: 0x00, 2: 0x20, 3: 0x30}}
+## Offsets at & around every level threshold of every variant
+BOUNDARY_OFFSETS = sorted({(2**bits) + d for levels in LEVEL_BITS.values() for bits in levels.values() for d in (-2, -1, 0)} | {0, 1})
+## The bit-packed variant (whole blocks of rows, see README)
+PACKED_VARIANT = 4
+VARIANTS = sorted(LEVEL_BITS) + [PACKED_VARIANT]
+
+
+## Reference codec; deliberately simple, shares no code with rdes.py
+
+def referenceEncode(rows, variant, refresh, blockRows=256):
+	"""
+	Encodes rows of unsigned values as described in the README.
+	"""
+	if (variant == PACKED_VARIANT):
+		return referencePackedEncode(rows, blockRows)
+	levels = sorted(LEVEL_BITS[variant].items())
+	out = bytearray()
+	last = None
+	sinceRaw = 0
+	for row in rows:
+		## First row & origin refreshes are stored raw
+		if (last is None or (refresh > 0 and sinceRaw >= refresh)):
+			for val in row:
+				out += (val & MAX_VALUE).to_bytes(4, "big")
+			last = list(row)
+			sinceRaw = 0
+			continue
+		for col, val in enumerate(row):
+			offset = val - last[col]
+			mag = abs(offset)
+			for lvl, bits in levels:
+				if (mag <= (2**bits)-1):
+					first = 0x80 | (0x40 if offset >= 0 else 0) | LEVEL_FLAGS[variant][lvl] | (mag >> (8*(lvl-1)))
+					out.append(first)
+					out += (mag & ((1 << (8*(lvl-1))) - 1)).to_bytes(lvl-1, "big")
+					break
+			else:
+				out += (val & MAX_VALUE).to_bytes(4, "big")
+			last[col] = val
+		sinceRaw += 1
+	return bytes(out)
+
+
+def referenceDecode(data, variant, numCols, signedCols=()):
+	"""
+	Decodes a stream; returns (complete rows, byte index at which
+	each value starts). Raises IndexError if a value is cut short.
+	"""
+	if (variant == PACKED_VARIANT):
+		return referencePackedDecode(data, numCols, signedCols)
+	last = [0]*numCols
+	values = []
+	starts = []
+	i = 0
+	while (i < len(data)):
+		starts.append(i)
+		col = len(values) % numCols
+		first = data[i]
+		if (not first & 0x80):
+			if (i + 4 > len(data)): raise IndexError("Truncated raw value")
+			val = int.from_bytes(bytes(data[i:i+4]), "big")
+			i += 4
+		else:
+			if (variant == 1):
+				size, mask = 3, 0x3F
+			elif (variant == 2):
+				size, mask = (3 if first & 0x20 else 2), 0x1F
+			elif (first & 0x20):
+				size, mask = (3 if first & 0x10 else 2), 0x0F
+			else:
+				size, mask = 1, 0x1F
+			if (i + size > len(data)): raise IndexError("Truncated offset")
+			mag = ((first & mask) << (8*(size-1))) | int.from_bytes(bytes(data[i+1:i+size]), "big")
+			val = last[col] + (mag if first & 0x40 else -mag)
+			i += size
+		last[col] = val
+		values.append(val)
+	rows = [values[k:k+numCols] for k in range(0, len(values) - len(values) % numCols, numCols)]
+	for row in rows:
+		for col in signedCols:
+			row[col] -= SIGN_OFFSET
+	return rows, starts
+
+
+def referencePackedEncode(rows, blockRows):
+	"""
+	Encodes rows as RDES4 blocks, packing deltas via a bit string.
+	"""
+	out = bytearray()
+	for b in range(0, len(rows), blockRows):
+		block = rows[b:b+blockRows]
+		out += len(block).to_bytes(2, "little")
+		groups = -(-(len(block)-1) // 8)
+		for col in range(len(block[0])):
+			vals = [row[col] for row in block]
+			deltas = [y - x for x, y in zip(vals, vals[1:])]
+			ref = min(deltas, default=0)
+			deltas = [d - ref for d in deltas]
+			## Cheapest width; ties go to the narrowest
+			best = None
+			for width in range(34):
+				wide = [k for k, d in enumerate(deltas) if d >= 2**width]
+				size = groups*width + 6*len(wide)
+				if (best is None or size < best[0]):
+					best = (size, width, wide)
+			size, width, wide = best
+			out += vals[0].to_bytes(4, "little") + ref.to_bytes(4, "little", signed=True)
+			out += bytes([width]) + len(wide).to_bytes(2, "little")
+			bits = "".join(format(0 if k in wide else d, f"0{width}b")[::-1] for k, d in enumerate(deltas)) if width else ""
+			bits += "0" * (groups*8*width - len(bits))
+			out += bytes(int(bits[k:k+8][::-1], 2) for k in range(0, len(bits), 8))
+			for k in wide:
+				out += k.to_bytes(2, "little") + deltas[k].to_bytes(4, "little")
+	return bytes(out)
+
+
+def referencePackedDecode(data, numCols, signedCols=()):
+	"""
+	Decodes RDES4 blocks; returns (rows, byte index at which each
+	block starts). Raises IndexError if a block is cut short.
+	"""
+	rows = []
+	starts = []
+	i = 0
+	def take(n):
+		nonlocal i
+		if (i + n > len(data)): raise IndexError("Truncated block")
+		i += n
+		return bytes(data[i-n:i])
+	while (i < len(data)):
+		starts.append(i)
+		numRows = int.from_bytes(take(2), "little")
+		numDeltas = max(numRows - 1, 0)
+		cols = []
+		for col in range(numCols):
+			header = take(11)
+			first = int.from_bytes(header[0:4], "little")
+			ref = int.from_bytes(header[4:8], "little", signed=True)
+			width = header[8]
+			numWide = int.from_bytes(header[9:11], "little")
+			if (width > 32): raise ValueError("Invalid width")
+			if (i + (-(-numDeltas // 8))*width + 6*numWide > len(data)): raise IndexError("Truncated block")
+			bits = "".join(format(byte, "08b")[::-1] for byte in take((-(-numDeltas // 8))*width))
+			deltas = [int(bits[k*width:(k+1)*width][::-1] or "0", 2) for k in range(numDeltas)]
+			for e in range(numWide):
+				wide = take(6)
+				deltas[int.from_bytes(wide[0:2], "little")] = int.from_bytes(wide[2:6], "little")
+			vals = [first] if numRows else []
+			for d in deltas:
+				vals.append(vals[-1] + d + ref)
+			cols.append(vals)
+		rows.extend(list(row) for row in zip(*cols))
+	for row in rows:
+		for col in signedCols:
+			row[col] -= SIGN_OFFSET
+	return rows, starts
+
+
+## Encode paths; each returns the compressed bytes
+
+def _newCompressor(rows, variant, refresh, blockRows, **kwargs):
+	return RDESCompressor(variant=variant, numCols=len(rows[0]) if rows else 1, originRefreshInterval=refresh, blockRows=blockRows, **kwargs)
+
+
+def _encodeRows(rows, variant, refresh, blockRows, **kwargs):
+	comp = _newCompressor(rows, variant, refresh, blockRows, **kwargs)
+	for row in rows:
+		comp.writeCompressedRow(row)
+	return bytes(comp.getCompressedData())
+
+
+def _encodeTraced(rows, variant, refresh, blockRows, rng):
+	return _encodeRows(rows, variant, refresh, blockRows, trace=lambda text: None)
+
+
+def _encodeStats(rows, variant, refresh, blockRows, rng):
+	"""
+	Encodes with stats enabled; the counters must match the output.
+	"""
+	numCols = len(rows[0]) if rows else 1
+	stats = RDESStats(variant=variant, numCols=numCols)
+	data = _encodeRows(rows, variant, refresh, blockRows, stats=stats)
+	counters = stats.asDict()
+	if (counters["rowsEncoded"] != len(rows) or counters["bytesEncoded"] != len(data)):
+		raise FuzzFailure(f"stats count {counters['rowsEncoded']} rows, {counters['bytesEncoded']}B "
+			f"for {len(rows)} rows, {len(data)}B (RDES{variant})")
+	return data
+
+
+def _encodeBulk(rows, variant, refresh, blockRows, rng):
+	comp = _newCompressor(rows, variant, refresh, blockRows)
+	comp.writeCompressedRows(rows)
+	return bytes(comp.getCompressedData())
+
+
+def _encodeBuffer(rows, variant, refresh, blockRows, rng):
+	comp = _newCompressor(rows, variant, refresh, blockRows)
+	comp.writeCompressedRows(array("q", [val for row in rows for val in row]))
+	return bytes(comp.getCompressedData())
+
+
+def _encodeCheckpoint(rows, variant, refresh, blockRows, rng):
+	"""
+	Compresses part of the rows, then continues in a new
+	compressor restored from a checkpoint.
+	"""
+	split = rng.randint(0, len(rows))
+	comp = _newCompressor(rows, variant, refresh, blockRows)
+	comp.writeCompressedRows(rows[:split])
+	comp2 = _newCompressor(rows, variant, refresh, blockRows)
+	comp2.restoreState(comp.getState())
+	comp2.writeCompressedRows(rows[split:])
+	return bytes(comp.getCompressedData()) + bytes(comp2.getCompressedData())
+
+
+def _encodeTaken(rows, variant, refresh, blockRows, rng):
+	"""
+	Takes the compressed data at random points along the way.
+	"""
+	comp = _newCompressor(rows, variant, refresh, blockRows)
+	out = bytearray()
+	for row in rows:
+		comp.writeCompressedRow(row)
+		if (rng.random() < 0.1):
+			out += comp.takeCompressedData()
+	return bytes(out + comp.takeCompressedData())
+
+
+ENCODERS = {
+	"reference": lambda rows, variant, refresh, blockRows, rng: referenceEncode(rows, variant, refresh, blockRows),
+	"writeCompressedRow": lambda rows, variant, refresh, blockRows, rng: _encodeRows(rows, variant, refresh, blockRows),
+	"traced": _encodeTraced,
+	"stats": _encodeStats,
+	"writeCompressedRows": _encodeBulk,
+	"buffer": _encodeBuffer,
+	"checkpoint": _encodeCheckpoint,
+	"takeCompressedData": _encodeTaken,
+}
+## Encoders which seal RDES4 blocks early (at a checkpoint or take);
+## their bytes legitimately differ, so only their rows are compared
+SEALING_ENCODERS = ("checkpoint", "takeCompressedData")
+
+
+## Decode paths; each returns the complete rows (or raises)
+
+def _newDecompressor(variant, numCols, signedCols, **kwargs):
+	return RDESDecompressor(variant=variant, numCols=numCols, signedCols=list(signedCols), **kwargs)
+
+
+def _decodeInto(data, variant, numCols, signedCols, blockRows, starts, rng):
+	deco = _newDecompressor(variant, numCols, signedCols)
+	out = array("q", [0]) * len(data)
+	if (variant == PACKED_VARIANT):
+		out *= 1 + len(starts)*blockRows*numCols # Blocks can hold more values than bytes
+	end = deco.decompressInto(data, out)
+	end -= end % numCols
+	return [out[k:k+numCols].tolist() for k in range(0, end, numCols)]
+
+
+def _decodePartial(data, variant, numCols, signedCols, blockRows, starts, rng):
+	"""
+	Decodes through small, randomly sized output buffers
+	(whole blocks for RDES4).
+	"""
+	deco = _newDecompressor(variant, numCols, signedCols)
+	unit = blockRows*numCols if (variant == PACKED_VARIANT) else 1
+	values = []
+	i = 0
+	while (i < len(data)):
+		out = array("q", [0]) * (rng.randint(1, 3*numCols) * unit)
+		end, i = deco.decompressPartial(data, out, 0, i)
+		values.extend(out[:end])
+	return [values[k:k+numCols] for k in range(0, len(values) - len(values) % numCols, numCols)]
+
+
+def _decodeIncremental(data, variant, numCols, signedCols, blockRows, starts, rng):
+	"""
+	Feeds the stream in pieces split at random value
+	(RDES4: block) boundaries.
+	"""
+	deco = _newDecompressor(variant, numCols, signedCols)
+	cuts = sorted(rng.sample(starts, min(len(starts), rng.randint(0, 4)))) + [len(data)]
+	rows = []
+	prev = 0
+	for cut in cuts:
+		rows.extend(deco.decompress(data[prev:cut]))
+		prev = cut
+	return rows
+
+
+def _decodeCheckpoint(data, variant, numCols, signedCols, blockRows, starts, rng):
+	"""
+	Decodes part of the stream, then continues in a new
+	decompressor restored from a checkpoint.
+	"""
+	cut = rng.choice(starts) if starts else 0
+	deco = _newDecompressor(variant, numCols, signedCols)
+	rows = deco.decompress(data[:cut])
+	deco2 = _newDecompressor(variant, numCols, signedCols)
+	deco2.restoreState(deco.getState())
+	return rows + deco2.decompress(data[cut:])
+
+
+def _decodeMixed(data, variant, numCols, signedCols, blockRows, starts, rng):
+	"""
+	Decodes pieces split at random value (RDES4: block) boundaries
+	with decompressInto(), moving to a restored checkpoint at
+	random, then finishes with decompress() or decompressTable();
+	rows left unfinished by decompressInto() must be continued.
+	"""
+	deco = _newDecompressor(variant, numCols, signedCols)
+	cuts = sorted(rng.sample(starts, min(len(starts), rng.randint(1, 4)))) if starts else []
+	values = []
+	prev = 0
+	for cut in cuts:
+		out = array("q", [0]) * (cut - prev)
+		if (variant == PACKED_VARIANT):
+			out *= 1 + len(starts)*blockRows*numCols
+		end = deco.decompressInto(data[prev:cut], out)
+		values.extend(out[:end])
+		prev = cut
+		if (rng.random() < 0.3):
+			restored = _newDecompressor(variant, numCols, signedCols)
+			restored.restoreState(deco.getState())
+			deco = restored
+	## The unfinished row is returned again, completed
+	rows = [values[k:k+numCols] for k in range(0, len(values) - len(values) % numCols, numCols)]
+	if (rng.random() < 0.5):
+		return rows + deco.decompress(data[prev:])
+	return rows + deco.decompressTable(data[prev:]).tolist()
+
+
+DECODERS = {
+	"reference": lambda data, variant, numCols, signedCols, blockRows, starts, rng: referenceDecode(data, variant, numCols, signedCols)[0],
+	"decompress": lambda data, variant, numCols, signedCols, blockRows, starts, rng: _newDecompressor(variant, numCols, signedCols).decompress(data),
+	"traced": lambda data, variant, numCols, signedCols, blockRows, starts, rng: _newDecompressor(variant, numCols, signedCols, trace=lambda text: None).decompress(data),
+	"memoryview": lambda data, variant, numCols, signedCols, blockRows, starts, rng: _newDecompressor(variant, numCols, signedCols).decompress(memoryview(data)),
+	"decompressTable": lambda data, variant, numCols, signedCols, blockRows, starts, rng: _newDecompressor(variant, numCols, signedCols).decompressTable(data).tolist(),
+	"decompressInto": _decodeInto,
+	"decompressPartial": _decodePartial,
+	"incremental": _decodeIncremental,
+	"checkpoint": _decodeCheckpoint,
+	"mixed": _decodeMixed,
+}
+
+
+## Table generation
+
+def randomTable(rng, maxRows):
+	"""
+	Returns (rows, signedCols) of unsigned (stored) values; columns
+	walk by offsets drawn around the level thresholds, small noise,
+	big jumps, or stay constant.
+	"""
+	numCols = rng.randint(1, 5)
+	numRows = rng.randint(0, maxRows)
+	signedCols = sorted(rng.sample(range(numCols), rng.randint(0, numCols)))
+	modes = [rng.choice(("boundary", "noise", "jump", "constant", "mixed")) for col in range(numCols)]
+	vals = [rng.choice((0, MAX_VALUE, SIGN_OFFSET, rng.randint(0, MAX_VALUE))) for col in range(numCols)]
+	rows = []
+	for r in range(numRows):
+		for col, mode in enumerate(modes):
+			if (mode == "mixed"): mode = rng.choice(("boundary", "noise", "jump"))
+			if (mode == "boundary"):
+				step = rng.choice(BOUNDARY_OFFSETS)
+			elif (mode == "noise"):
+				step = rng.randint(0, 2**rng.randint(0, 8))
+			elif (mode == "jump"):
+				step = rng.randint(0, MAX_VALUE)
+			else:
+				step = 0
+			step = step if rng.random() < 0.5 else -step
+			## Reflect off the ends of the range to keep exact offsets
+			val = vals[col] + step
+			if (val < 0 or val > MAX_VALUE):
+				val = vals[col] - step
+			vals[col] = min(max(val, 0), MAX_VALUE)
+		rows.append(list(vals))
+	## An empty table is decoded as 1 column
+	return rows, (signedCols if rows else [])
+
+
+def boundaryTable(variant):
+	"""
+	Returns rows stepping by exactly each level threshold
+	(RDES4: every bit width) and one past it, up and down,
+	plus raw extremes.
+	"""
+	rows = [[SIGN_OFFSET, 0, MAX_VALUE]]
+	widths = range(31) if (variant == PACKED_VARIANT) else sorted(LEVEL_BITS[variant].values())
+	for bits in widths:
+		for step in ((2**bits)-1, 2**bits):
+			for sign in (1, -1):
+				last = rows[-1]
+				rows.append([last[0] + sign*step, min(step, MAX_VALUE), MAX_VALUE - step])
+	rows.append([MAX_VALUE, MAX_VALUE, 0])
+	rows.append([0, 0, MAX_VALUE])
+	return rows
+
+
+## Checks
+
+class FuzzFailure(Exception):
+	pass
+
+
+def _signed(rows, signedCols):
+	return [[val - SIGN_OFFSET if col in signedCols else val for col, val in enumerate(row)] for row in rows]
+
+
+def _outcome(func, *args):
+	"""
+	Returns ("ok", result) or ("error", exception type name).
+	"""
+	try:
+		return ("ok", func(*args))
+	except (IndexError, ValueError) as e:
+		return ("error", type(e).__name__)
+
+
+def checkRoundTrip(rows, signedCols, variant, refresh, blockRows, rng):
+	"""
+	Checks that every encoder produces identical bytes, and that
+	every decoder recovers the rows. Returns the stream.
+	"""
+	numCols = len(rows[0]) if rows else 1
+	expected = None
+	for name, encode in ENCODERS.items():
+		data = encode(rows, variant, refresh, blockRows, random.Random(rng.random()))
+		if (expected is None):
+			expected = data
+		elif (variant == PACKED_VARIANT and name in SEALING_ENCODERS):
+			if (referenceDecode(data, variant, numCols)[0] != rows):
+				raise FuzzFailure(f"encoder {name!r} failed to round-trip (RDES{variant}, blockRows={blockRows})")
+		elif (data != expected):
+			raise FuzzFailure(f"encoder {name!r} differs from reference (RDES{variant}, refresh={refresh}, blockRows={blockRows})")
+
+	starts = referenceDecode(expected, variant, numCols)[1]
+	wanted = _signed(rows, signedCols)
+	for name, decode in DECODERS.items():
+		got = decode(expected, variant, numCols, signedCols, blockRows, starts, random.Random(rng.random()))
+		if (got != wanted):
+			raise FuzzFailure(f"decoder {name!r} failed to round-trip (RDES{variant}, refresh={refresh}, signed={signedCols})")
+	return expected
+
+
+def checkDamaged(data, rows, signedCols, variant, blockRows, rng):
+	"""
+	Checks the decoders on truncated & corrupted copies of a
+	stream: they may only raise IndexError/ValueError, must agree
+	with the reference, and a truncated stream must decode to a
+	prefix of the rows.
+
+	decompressPartial() is skipped for RDES4, as a damaged block
+	header may claim more rows than its output buffer holds.
+	"""
+	numCols = len(rows[0]) if rows else 1
+	wanted = _signed(rows, signedCols)
+	damaged = []
+	if (data):
+		cut = rng.randrange(len(data))
+		damaged.append(("truncated", data[:cut]))
+		corrupt = bytearray(data)
+		for k in range(rng.randint(1, 3)):
+			corrupt[rng.randrange(len(corrupt))] ^= 1 << rng.randrange(8)
+		damaged.append(("bit-flipped", bytes(corrupt)))
+		corrupt = bytearray(data)
+		corrupt[rng.randrange(len(corrupt))] = rng.randrange(256)
+		damaged.append(("byte-replaced", bytes(corrupt)))
+		pos = rng.randrange(len(data))
+		damaged.append(("byte-deleted", data[:pos] + data[pos+1:]))
+	damaged.append(("random", bytes(rng.randrange(256) for k in range(rng.randint(0, 64)))))
+
+	for kind, bad in damaged:
+		reference = _outcome(referenceDecode, bad, variant, numCols, signedCols)
+		if (reference[0] == "ok"):
+			starts = reference[1][1]
+			reference = ("ok", reference[1][0])
+		else:
+			starts = []
+		if (kind == "truncated" and reference[0] == "ok" and reference[1] != wanted[:len(reference[1])]):
+			raise FuzzFailure(f"truncated stream did not decode to a prefix (RDES{variant})")
+		names = ["decompress", "traced", "memoryview", "decompressTable"]
+		if (variant != PACKED_VARIANT): names.append("decompressPartial")
+		for name in names:
+			got = _outcome(DECODERS[name], bad, variant, numCols, signedCols, blockRows, starts, random.Random(0))
+			if (got != reference):
+				raise FuzzFailure(f"decoder {name!r} disagrees with reference on {kind} input (RDES{variant}): {got[0]} vs {reference[0]}")
+
+
+## Time-series store (rdesStore.py)
+
+def _windowAggregates(rows, t0, t1, column):
+	"""
+	Returns what RDESStore.aggregate() must return for the given
+	rows (as returned by query()).
+	"""
+	vals = [row[column] for row in rows if (t0 <= row[0] < t1)]
+	if (not vals):
+		return {"min": None, "max": None, "sum": 0, "count": 0, "mean": None}
+	return {"min": min(vals), "max": max(vals), "sum": sum(vals), "count": len(vals), "mean": sum(vals) / len(vals)}
+
+
+def checkStore(rng, windows:int=20):
+	"""
+	Appends a random series (in random batches, including batches
+	it must reject) to an RDESStore, then checks that query() returns
+	exactly the appended rows, and that aggregate() & countAbove()
+	(answered partly from chunk summaries) agree with query(); before
+	sealing, after flush() & after reopening. Returns a list of
+	failure messages.
+	"""
+	from rdesStore import RDESStore
+	failures = []
+	rows, signedCols = randomTable(rng, 300)
+	if (not rows):
+		return failures
+	## Column 0 becomes a (non-decreasing) timestamp
+	signedCols = [col for col in signedCols if (col != 0)]
+	t = rng.randint(0, 2**40)
+	for row in rows:
+		t += rng.choice((0, 1, 1, 2, 1000))
+		row[0] = t
+	expected = _signed(rows, signedCols)
+	numCols = len(rows[0])
+	label = f"store ({len(rows)} rows x {numCols} cols, signed {signedCols})"
+
+	with tempfile.TemporaryDirectory() as tmp:
+		variant = rng.choice(VARIANTS)
+		store = RDESStore(tmp, variant=variant, chunkRows=rng.choice((1, 3, 16, 64)))
+		store.createSeries("s", numCols, signedCols)
+		pos = 0
+		while (pos < len(expected)):
+			end = min(pos + rng.randint(1, 40), len(expected))
+			if (numCols > 1 and rng.random() < 0.2):
+				## A batch holding one out-of-range value must change nothing
+				bad = [list(row) for row in expected[pos:end]]
+				col = rng.randrange(1, numCols)
+				bad[-1][col] = rng.choice((-SIGN_OFFSET - 1, MAX_VALUE - SIGN_OFFSET + 1)) if (col in signedCols) else rng.choice((-1, MAX_VALUE + 1))
+				try:
+					store.append("s", bad)
+					failures.append(f"{label}: out-of-range value {bad[-1][col]} in column {col} was accepted")
+					store.close()
+					return failures
+				except ValueError:
+					pass
+			store.append("s", expected[pos:end])
+			pos = end
+
+		tMin, tMax = expected[0][0], expected[-1][0]
+		for stage in ("open", "flushed", "reopened"):
+			if (stage == "flushed"):
+				store.flush()
+			elif (stage == "reopened"):
+				store.close()
+				store = RDESStore(tmp)
+			got = store.query("s", tMin, tMax + 1)
+			if (got != expected):
+				failures.append(f"{label} RDES{variant}, {stage}: query() does not return the appended rows")
+				continue
+			for k in range(windows):
+				t0 = rng.randint(tMin - 2, tMax + 2)
+				t1 = t0 + rng.choice((1, 2, 100, 5000, 2**40))
+				column = rng.randrange(numCols)
+				window = store.query("s", t0, t1)
+				aggregates = store.aggregate("s", t0, t1, column)
+				if (aggregates != _windowAggregates(window, t0, t1, column)):
+					failures.append(f"{label} RDES{variant}, {stage}: aggregate({t0}, {t1}, {column}) = {aggregates} disagrees with query()")
+				threshold = rng.choice([row[column] for row in expected])
+				count = sum(1 for row in window if (row[column] > threshold))
+				if (store.countAbove("s", t0, t1, column, threshold) != count):
+					failures.append(f"{label} RDES{variant}, {stage}: countAbove({t0}, {t1}, {column}, {threshold}) disagrees with query()")
+		store.close()
+	return failures
+
+
+## Timestamp channel (rdesTime.py)
+
+def checkTimed(rng):
+	"""
+	Compresses a random table whose column 0 is replaced by
+	timestamps (regular, jittered, with gaps or repeats; including
+	timestamp-only tables) with an RDESTimedCompressor, and checks
+	that it decodes (from random pieces), and that readTimestamps()
+	& locate() agree with the rows. Returns a list of failure
+	messages.
+	"""
+	from rdesTime import RDESTimedCompressor, RDESTimedDecompressor
+	from bisect import bisect_left
+	failures = []
+	rows, signedCols = randomTable(rng, 300)
+	if (not rows):
+		return failures
+	signedCols = [col for col in signedCols if (col != 0)]
+	period = rng.choice((1, 10, 1000))
+	t = rng.randint(-2**40, 2**40)
+	for row in rows:
+		t += rng.choice((period, period, period, period + rng.randint(-period, period), 0, rng.randint(0, 2**32)))
+		row[0] = t
+	numCols = len(rows[0])
+	variant = rng.choice(VARIANTS)
+	label = f"timed RDES{variant} ({len(rows)} rows x {numCols} cols)"
+
+	comp = RDESTimedCompressor(variant=variant, numCols=numCols, blockRows=rng.choice((1, 7, 64, 1024)))
+	pos = 0
+	while (pos < len(rows)):
+		end = min(pos + rng.randint(1, 100), len(rows))
+		comp.writeCompressedRows(rows[pos:end])
+		if (rng.random() < 0.3): comp.flush()
+		pos = end
+	comp.flush()
+	data = bytes(comp.getCompressedData())
+
+	expected = _signed(rows, signedCols)
+	deco = RDESTimedDecompressor(variant=variant, numCols=numCols, signedCols=signedCols)
+	got = []
+	prev = 0
+	for cut in sorted(rng.sample(range(len(data)), min(len(data), rng.randint(0, 4)))) + [len(data)]:
+		got.extend(deco.decompress(data[prev:cut]))
+		prev = cut
+	if (got != expected):
+		failures.append(f"{label}: failed to round-trip")
+		return failures
+	times = [row[0] for row in rows]
+	if (RDESTimedDecompressor(variant=variant, numCols=numCols).readTimestamps(data) != times):
+		failures.append(f"{label}: readTimestamps() disagrees with the rows")
+	if (times == sorted(times)):
+		for k in range(10):
+			target = rng.randint(times[0] - 2, times[-1] + 2)
+			if (deco.locate(data, target) != bisect_left(times, target)):
+				failures.append(f"{label}: locate({target}) returned {deco.locate(data, target)}, expected {bisect_left(times, target)}")
+	return failures
+
+
+## Fixed-size ring buffer (rdesRing.py)
+
+def checkRing(rng):
+	"""
+	Writes a random table into an RDESRingCompressor too small to
+	hold it (row by row & in bulk), and checks after every write
+	that the retained data decodes to exactly the newest rows, as
+	counted by getRowWindow(). Returns a list of failure messages.
+	"""
+	from rdesRing import RDESRingCompressor
+	failures = []
+	rows = randomTable(rng, 300)[0]
+	if (not rows):
+		return failures
+	numCols = len(rows[0])
+	variant = rng.choice(sorted(LEVEL_BITS))
+	refresh = rng.choice((1, 5, 17))
+	minimum = (refresh + 1) * numCols * 4
+	capacity = rng.randint(minimum, 3 * minimum)
+	ring = RDESRingCompressor(variant=variant, numCols=numCols, capacity=capacity, originRefreshInterval=refresh, timeCol=0)
+	label = f"ring RDES{variant} ({len(rows)} rows x {numCols} cols, refresh={refresh}, capacity={capacity})"
+	pos = 0
+	while (pos < len(rows)):
+		end = min(pos + rng.choice((1, 1, 7, 50)), len(rows))
+		if (end - pos == 1):
+			ring.writeCompressedRow(rows[pos])
+		else:
+			ring.writeCompressedRows(rows[pos:end])
+		pos = end
+		first, last = ring.getRowWindow()
+		data = bytes(ring.getCompressedData())
+		if (last != pos or len(data) != ring.getCompressedSize() or len(data) > capacity):
+			failures.append(f"{label}: window ({first}, {last}), {len(data)}B after {pos} rows")
+			return failures
+		if (RDESDecompressor(variant=variant, numCols=numCols).decompress(data) != rows[first:last]):
+			failures.append(f"{label}: retained data does not decode to rows {first}..{last} after {pos} rows")
+			return failures
+		if (ring.getTimeWindow() != (rows[first][0], rows[last-1][0])):
+			failures.append(f"{label}: getTimeWindow() is {ring.getTimeWindow()} after {pos} rows")
+			return failures
+	return failures
+
+
+## Random-access file reads (rdesReader.py)
+
+def checkReader(rng):
+	"""
+	Writes a random table's stream to a file in random pieces (as a
+	logger would, cutting values in half), and checks after every
+	piece that an RDESFileReader returns exactly the complete rows
+	so far, from random row ranges. Returns a list of failure
+	messages.
+	"""
+	from rdesReader import RDESFileReader
+	failures = []
+	rows, signedCols = randomTable(rng, 300)
+	if (not rows):
+		return failures
+	numCols = len(rows[0])
+	variant = rng.choice(VARIANTS)
+	compBlockRows = rng.choice((1, 7, 64))
+	data = _encodeRows(rows, variant, 0, compBlockRows)
+	expected = _signed(rows, signedCols)
+	label = f"reader RDES{variant} ({len(rows)} rows x {numCols} cols)"
+
+	with tempfile.TemporaryDirectory() as tmp:
+		path = os.path.join(tmp, "log.rdes")
+		open(path, "wb").close()
+		blockRows = compBlockRows * rng.choice((1, 2, 5)) if (variant == PACKED_VARIANT) else rng.choice((1, 5, 64))
+		reader = RDESFileReader(path, variant=variant, numCols=numCols, signedCols=signedCols, blockRows=blockRows)
+		pos = 0
+		while (pos < len(data)):
+			pos = min(pos + rng.randint(1, 200), len(data))
+			with open(path, "r+b") as f:
+				f.seek(0, os.SEEK_END)
+				f.write(data[f.tell():pos])
+			numRows = reader.getNumRows()
+			if (not 0 <= numRows <= len(expected) or (pos == len(data) and numRows != len(expected))):
+				failures.append(f"{label}: {numRows} rows after {pos} of {len(data)} bytes")
+				return failures
+			start = rng.randint(0, numRows)
+			stop = rng.randint(start, numRows + 2)
+			if (reader.readRows(start, stop) != expected[start:min(stop, numRows)]):
+				failures.append(f"{label}: readRows({start}, {stop}) is wrong after {pos} of {len(data)} bytes")
+				return failures
+
+		## RDES4 blocks larger than the reader's blockRows are an error
+		if (variant == PACKED_VARIANT and 1 < compBlockRows <= len(rows)):
+			try:
+				RDESFileReader(path, variant=variant, numCols=numCols, blockRows=compBlockRows - 1)
+				failures.append(f"{label}: blocks of {compBlockRows} rows were read with blockRows={compBlockRows - 1}")
+			except ValueError:
+				pass
+	return failures
+
+
+## Sharded front end (rdesConcurrent.py)
+
+def checkSharded(rng):
+	"""
+	Feeds random streams to an RDESShardedCompressor from several
+	producer threads, mixing writeRow(), writeRows() & takes, and
+	checks that every stream's bytes match a plain RDESCompressor's,
+	that a failing stream does not affect the others, and that
+	rows queued after close() are refused. Returns a list of failure
+	messages.
+	"""
+	from rdesConcurrent import RDESShardedCompressor
+	from threading import Thread
+	failures = []
+	numCols = rng.randint(1, 5)
+	variant = rng.choice(sorted(LEVEL_BITS))
+	streams = {}
+	for key in range(6):
+		rows = randomTable(rng, 300)[0]
+		streams[f"s{key}"] = [(row * numCols)[:numCols] for row in rows]
+	plans = {key: [rng.randint(0, 20) for k in range(len(rows))] for key, rows in streams.items()}
+
+	comp = RDESShardedCompressor(variant=variant, numCols=numCols, numShards=rng.randint(1, 3), batchSize=rng.choice((1, 16, 1024)))
+	taken = {key: bytearray() for key in streams}
+	def produce(key):
+		rows = streams[key]
+		pos = 0
+		try:
+			while (pos < len(rows)):
+				step = plans[key][pos]
+				if (step == 0):
+					comp.writeRow(key, rows[pos])
+				else:
+					comp.writeRows(key, rows[pos:pos + step])
+				pos += max(step, 1)
+				if (step == 1):
+					taken[key] += comp.takeCompressedData(key)
+		except Exception as e:
+			failures.append(f"sharded RDES{variant}: stream {key} raised {type(e).__name__}: {e}")
+	threads = [Thread(target=produce, args=(key,)) for key in streams]
+	for thread in threads: thread.start()
+	comp.writeRow("bad", [None]*numCols)
+	for thread in threads: thread.join()
+	comp.close()
+
+	for key, rows in streams.items():
+		taken[key] += comp.takeCompressedData(key)
+		if (rows and taken[key] != _encodeRows(rows, variant, 0, 256)):
+			failures.append(f"sharded RDES{variant}: stream {key} ({len(rows)} rows x {numCols} cols) differs from RDESCompressor")
+	if (set(comp.getErrors()) != {"bad"}):
+		failures.append(f"sharded RDES{variant}: failed streams are {sorted(comp.getErrors())}, expected ['bad']")
+	try:
+		comp.writeRow("s0", [0]*numCols)
+		failures.append(f"sharded RDES{variant}: a row was accepted after close()")
+	except RuntimeError:
+		pass
+	return failures
+
+
+## Command-line tool round trips (rdesCli.py)
+
+def _writeNpy(path, descr, shape, values):
+	"""
+	Writes an NPY file (version 1.0) without NumPy.
+	"""
+	typecode = {"<i8": "q", "<u4": "I", "<i4": "i"}[descr]
+	header = f"{{'descr': '{descr}', 'fortran_order': False, 'shape': {shape}, }}"
+	header = header.ljust(64 - 10 - 1) + "\n"
+	with open(path, "wb") as f:
+		f.write(b"\x93NUMPY\x01\x00" + struct.pack("<H", len(header)) + header.encode("latin1"))
+		array(typecode, values).tofile(f)
+
+
+def _readOutput(path, fmt, numCols):
+	"""
+	Returns the rows of a decompressed CSV / NPY (int64) / raw
+	(int64) file, read without rdesCli.
+	"""
+	if (fmt == "csv"):
+		with open(path, newline="") as f:
+			return [line for line in csv.reader(f)]
+	with open(path, "rb") as f:
+		data = f.read()
+	if (fmt == "npy"):
+		data = data[10 + struct.unpack("<H", data[8:10])[0]:]
+	values = array("q")
+	values.frombytes(data)
+	return [values[k:k+numCols].tolist() for k in range(0, len(values), numCols)]
+
+
+def checkCli():
+	"""
+	Compresses & decompresses small CSV, NPY & raw files through the
+	command-line tool, including inputs it must reject (values over
+	31 bits, negative values in unsigned columns, ragged CSV rows,
+	truncated streams) and an empty CSV. Returns a list of failure
+	messages.
+	"""
+	import rdesCli
+	failures = []
+	big = MAX_VALUE + 6 # 2**31 + 5
+	## (name, file contents or NPY (descr, shape, values), compress options,
+	##  output format, expected output rows or None if it must be rejected)
+	cases = [
+		("csv", "t,x\n1,-5\n2,30\n", {"signed": "1"}, "csv", [["t", "x"], ["1", "-5"], ["2", "30"]]),
+		("csv", "1,-5\n2,3\n", {}, "csv", None),
+		("csv", "1,5\n2,3000000000\n", {}, "csv", None),
+		("csv", "1,2\n3,4,5\n", {}, "csv", None),
+		("csv", "", {}, "csv", []),
+		("npy", ("<i8", (3, 2), [0, -7, MAX_VALUE - SIGN_OFFSET, 4, -SIGN_OFFSET, 9]), {}, "npy",
+			[[0, -7], [MAX_VALUE - SIGN_OFFSET, 4], [-SIGN_OFFSET, 9]]),
+		("npy", ("<i8", (2,), [1, big]), {}, "npy", None),
+		("npy", ("<u4", (2,), [1, MAX_VALUE + 1]), {}, "npy", None),
+		("npy", ("<u4", (3,), [1, MAX_VALUE, 0]), {}, "raw", [[1], [MAX_VALUE], [0]]),
+		("raw", [5, 6, 7, -8, 9, 1000000], {"numCols": 3, "dtype": "int32"}, "raw", [[5, 6, 7], [-8, 9, 1000000]]),
+		("raw", [5, 6, 7, -8, 9, 1000000], {"numCols": 3, "dtype": "int32", "signed": "none"}, "raw", None),
+	]
+	with tempfile.TemporaryDirectory() as tmp:
+		for index, (fmt, content, options, outFmt, expected) in enumerate(cases):
+			src = os.path.join(tmp, f"in{index}.{fmt}")
+			dst = src + ".rdes"
+			out = os.path.join(tmp, f"out{index}.{outFmt}")
+			if (fmt == "csv"):
+				with open(src, "w") as f:
+					f.write(content)
+			elif (fmt == "npy"):
+				_writeNpy(src, *content)
+			else:
+				with open(src, "wb") as f:
+					array("i", content).tofile(f)
+			label = f"CLI case {index} ({fmt} -> {outFmt})"
+			try:
+				meta = rdesCli.compressFile(src, dst, fmt=fmt, **options)
+			except ValueError as e:
+				if (expected is not None):
+					failures.append(f"{label}: compress failed: {e}")
+				elif (os.path.exists(dst)):
+					failures.append(f"{label}: rejected input left {dst}")
+				continue
+			except Exception as e:
+				failures.append(f"{label}: unexpected {type(e).__name__}: {e}")
+				continue
+			if (expected is None):
+				failures.append(f"{label}: invalid input was accepted")
+				continue
+			try:
+				rdesCli.decompressFile(dst, out, fmt=outFmt)
+				got = _readOutput(out, outFmt, meta["numCols"])
+			except Exception as e:
+				failures.append(f"{label}: decompress raised {type(e).__name__}: {e}")
+				continue
+			if (got != expected):
+				failures.append(f"{label}: round trip gave {got}, expected {expected}")
+
+		## Truncated streams must fail cleanly (a ValueError, no output)
+		src = os.path.join(tmp, "damaged.csv")
+		with open(src, "w") as f:
+			f.write("1,2\n3,400000000\n5,6\n")
+		for variant in VARIANTS:
+			dst = src + f".{variant}.rdes"
+			rdesCli.compressFile(src, dst, variant=variant)
+			with open(dst, "rb") as f:
+				data = f.read()
+			for cut in range(len(data)):
+				with open(dst, "wb") as f:
+					f.write(data[:cut])
+				out = os.path.join(tmp, "damaged.out.csv")
+				label = f"CLI damaged RDES{variant} input ({cut} of {len(data)} bytes)"
+				try:
+					rdesCli.decompressFile(dst, out)
+					failures.append(f"{label}: was accepted")
+				except ValueError:
+					if (os.path.exists(out)):
+						failures.append(f"{label}: left {out}")
+				except Exception as e:
+					failures.append(f"{label}: unexpected {type(e).__name__}: {e}")
+	return failures
+
+
+def run(cases:int=300, seed:int=None, maxRows:int=200, verbose:bool=False):
+	"""
+	Runs the fixed boundary tables, the given number of random
+	cases, the time-series store, file reader, timestamp channel,
+	ring buffer & sharded front end checks, and the command-line
+	round trips. Returns the number of failures.
+	"""
+	seed = random.randrange(2**32) if (seed is None) else seed
+	print(f"RDES fuzz: seed={seed}, cases={cases}")
+	failures = 0
+	levelCounts = {variant: {} for variant in LEVEL_BITS}
+
+	def attempt(label, rows, signedCols, variant, refresh, rng, blockRows=256):
+		nonlocal failures
+		try:
+			data = checkRoundTrip(rows, signedCols, variant, refresh, blockRows, rng)
+			checkDamaged(data, rows, signedCols, variant, blockRows, rng)
+			if (variant not in levelCounts): return
+			## Track which levels were exercised
+			stats = RDESStats(variant=variant, numCols=len(rows[0]) if rows else 1)
+			RDESCompressor(variant=variant, numCols=len(rows[0]) if rows else 1, stats=stats).writeCompressedRows(rows)
+			for col in range(len(rows[0]) if rows else 0):
+				for lvl, count in stats.getLevelHistogram(col).items():
+					levelCounts[variant][lvl] = levelCounts[variant].get(lvl, 0) + count
+		except FuzzFailure as e:
+			failures += 1
+			print(f"FAIL {label}: {e}")
+			if (verbose): print(f"\trows={rows}")
+		except Exception as e:
+			failures += 1
+			print(f"FAIL {label}: unexpected {type(e).__name__}: {e}")
+			if (verbose): print(f"\trows={rows}")
+
+	for variant in VARIANTS:
+		for refresh in (0, 1, 3):
+			attempt(f"boundary RDES{variant} refresh={refresh}", boundaryTable(variant), [], variant, refresh, random.Random(seed), blockRows=refresh or 256)
+
+	for case in range(cases):
+		rng = random.Random(seed * 1000003 + case)
+		rows, signedCols = randomTable(rng, maxRows)
+		variant = rng.choice(VARIANTS)
+		refresh = rng.choice((0, 0, 1, 2, 5, 17))
+		blockRows = rng.choice((1, 2, 7, 64, 256))
+		attempt(f"case {case} (seed {seed})", rows, signedCols, variant, refresh, rng, blockRows)
+
+	for case in range(max(cases // 10, 1)):
+		try:
+			messages = checkStore(random.Random(seed * 1000003 + cases + case))
+		except Exception as e:
+			messages = [f"store case {case}: unexpected {type(e).__name__}: {e}"]
+		try:
+			messages += checkReader(random.Random(seed * 1000003 + cases + case))
+		except Exception as e:
+			messages.append(f"reader case {case}: unexpected {type(e).__name__}: {e}")
+		try:
+			messages += checkTimed(random.Random(seed * 1000003 + cases + case))
+		except Exception as e:
+			messages.append(f"timed case {case}: unexpected {type(e).__name__}: {e}")
+		try:
+			messages += checkRing(random.Random(seed * 1000003 + cases + case))
+		except Exception as e:
+			messages.append(f"ring case {case}: unexpected {type(e).__name__}: {e}")
+		for message in messages:
+			failures += 1
+			print(f"FAIL {message} (seed {seed})")
+
+	try:
+		messages = checkSharded(random.Random(seed))
+	except Exception as e:
+		messages = [f"sharded: unexpected {type(e).__name__}: {e}"]
+	for message in messages:
+		failures += 1
+		print(f"FAIL {message} (seed {seed})")
+
+	for message in checkCli():
+		failures += 1
+		print(f"FAIL {message}")
+
+	for variant, counts in levelCounts.items():
+		print(f"RDES{variant} values per level: " + ", ".join(f"{lvl}B: {counts[lvl]}" for lvl in sorted(counts)))
+	print(f"{failures} failure(s)")
+	return failures
+
+
+if __name__ == "__main__":
+	parser = argparse.ArgumentParser(description="Differential fuzzing of the RDES codec paths.")
+	parser.add_argument("--cases", type=int, default=300, help="random tables to test")
+	parser.add_argument("--seed", type=int, help="seed (printed on every run, for reproducing failures)")
+	parser.add_argument("--max-rows", type=int, default=200, help="max rows per random table")
+	parser.add_argument("-v", "--verbose", action="store_true", help="print the rows of failing cases")
+	args = parser.parse_args()
+	sys.exit(1 if run(args.cases, args.seed, args.max_rows, args.verbose) else 0)
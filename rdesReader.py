@@ -0,0 +1,186 @@
+"""
+Date: Oct.19.2026
+
+Description: Random-access, cached reads of plain RDES files which may
+			 still be growing (e.g. a logger appending to them).
+"""
+
+from rdes import RDESDecompressor
+from rdesCache import RDESBlockCache
+from array import array
+from itertools import accumulate
+from bisect import bisect_right
+import mmap
+import os
+
+
+class RDESFileReader():
+	"""
+	Reads rows from anywhere in a plain RDES file (a single
+	compressed stream, as written by RDESCompressor) without
+	decoding it from the start every time.
+
+	The file is scanned once to split it into blocks of blockRows
+	rows (RDES4: whole RDES4 blocks, up to blockRows rows, which
+	must be at least the compressor's blockRows); for each block,
+	its byte range and the decoder's chain state at its start (see
+	RDESDecompressor.getState()) are kept.
+	A block can then be decoded on its own, and decoded blocks are
+	kept in an RDESBlockCache keyed by (file, block).
+
+	Before each read the file is checked for changes: if it was
+	appended to, only the (previously incomplete) last block is
+	invalidated & rescanned; if it was otherwise modified, every
+	block is.
+	"""
+
+	def __init__(self, path:str, variant:int=3, numCols:int=3, signedCols=[], blockRows:int=4096, cache:RDESBlockCache=None):
+		# File being read
+		self.__path = path
+		# Decoder settings
+		self.__variant = variant
+		self.__numCols = numCols
+		self.__signedCols = signedCols
+		# Rows per block
+		self.__blockRows = blockRows
+		# Decoded block cache (may be shared)
+		self.__cache = cache if (cache is not None) else RDESBlockCache()
+
+		# (start byte, end byte, rows, decoder state) per block
+		self.__blocks = []
+		# (size, inode, mtime) of the file when last scanned
+		self.__fileSig = None
+		self.refresh()
+
+
+	def __newDecompressor(self):
+		"""
+		Returns a decompressor with this reader's settings.
+		"""
+		return RDESDecompressor(variant=self.__variant, numCols=self.__numCols, signedCols=self.__signedCols)
+
+
+	def refresh(self):
+		"""
+		Checks the file for changes, updating the block index and
+		invalidating cached blocks as needed.
+
+		Called automatically before every read.
+		"""
+		stat = os.stat(self.__path)
+		sig = (stat.st_size, stat.st_ino, stat.st_mtime_ns)
+		if (sig == self.__fileSig):
+			return
+		old = self.__fileSig
+		self.__fileSig = sig
+
+		## Shrunk, rewritten or replaced; start over
+		resume = None
+		if (old is None or stat.st_size <= old[0] or stat.st_ino != old[1]):
+			self.__cache.invalidateFile(self.__path)
+			self.__blocks = []
+		## Appended; rescan from the start of the last block,
+		## which may have grown
+		elif (self.__blocks):
+			resume = self.__blocks.pop()
+			self.__cache.invalidate(self.__path, len(self.__blocks))
+
+		self.__scan(stat.st_size, resume)
+
+
+	def __scan(self, size, resume):
+		"""
+		Indexes the blocks from the given block (or the start of
+		the file) to the end of the file.
+		"""
+		deco = self.__newDecompressor()
+		start = 0
+		if (resume is not None):
+			start = resume[0]
+			deco.restoreState(resume[3])
+		if (start >= size):
+			return
+
+		out = array("q", [0]) * (self.__blockRows * self.__numCols)
+		with open(self.__path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+			## Released before the mmap closes, even if decoding fails
+			view = memoryview(data)
+			try:
+				while (start < size):
+					state = deco.getState()
+					try:
+						end, consumed = deco.decompressPartial(view, out, 0, start)
+					except IndexError:
+						break # Last value still being written; picked up on the next refresh
+					rows = end // self.__numCols
+					if (rows == 0):
+						break
+					self.__blocks.append((start, consumed, rows, state))
+					if (consumed >= size):
+						break # Last block; may still grow
+					start = consumed
+			finally:
+				view.release()
+
+
+	def getNumRows(self):
+		"""
+		Returns the number of (complete) rows in the file.
+		"""
+		self.refresh()
+		return sum(block[2] for block in self.__blocks)
+
+
+	def getNumBlocks(self):
+		"""
+		Returns the number of blocks in the file.
+		"""
+		self.refresh()
+		return len(self.__blocks)
+
+
+	def getCache(self):
+		"""
+		Returns the RDESBlockCache holding decoded blocks.
+		"""
+		return self.__cache
+
+
+	def getBlock(self, index:int):
+		"""
+		Returns the given block as an RDESTable, from the cache
+		if possible.
+		"""
+		table = self.__cache.get(self.__path, index)
+		if (table is not None):
+			return table
+
+		start, end, rows, state = self.__blocks[index]
+		deco = self.__newDecompressor()
+		deco.restoreState(state)
+		with open(self.__path, "rb") as f:
+			f.seek(start)
+			table = deco.decompressTable(f.read(end - start))
+		self.__cache.put(self.__path, index, table, 8*len(table.getValues()))
+		return table
+
+
+	def readRows(self, start:int, stop:int):
+		"""
+		Returns rows [start, stop) of the file as a list of lists,
+		decoding only the blocks they fall in.
+		"""
+		self.refresh()
+		## First row of each block (RDES4 blocks may be short)
+		firstRows = list(accumulate((block[2] for block in self.__blocks), initial=0))
+		stop = min(stop, firstRows[-1])
+		result = []
+		row = max(start, 0)
+		while (row < stop):
+			index = bisect_right(firstRows, row) - 1
+			table = self.getBlock(index)
+			first = row - firstRows[index]
+			last = min(stop - firstRows[index], len(table))
+			result.extend(table[first:last])
+			row = firstRows[index] + last
+		return result
@@ -0,0 +1,218 @@
+"""
+Date: Oct.19.2026
+
+Description: RDES compression into a fixed byte budget (e.g. a flash
+			 partition); the oldest refresh blocks are dropped to make
+			 room, like a circular log.
+"""
+
+from rdes import RDESCompressor
+from collections import deque
+
+
+class RDESRingCompressor():
+	"""
+	Compresses rows into a ring buffer of a fixed number of bytes,
+	keeping as much of the most recent data as fits.
+
+	The stream is split into refresh blocks by the origin refresh
+	interval: every block starts with a raw row, followed by up to
+	originRefreshInterval compressed rows. When a new row does not
+	fit, whole blocks are dropped from the oldest end, so the data
+	retained always starts with a raw row and stays decodable by a
+	plain RDESDecompressor.
+
+	Appending a row costs O(1): the bytes are written at the head of
+	a preallocated buffer (wrapping around its end), and dropping a
+	block only moves the tail.
+
+	If timeCol is given, that column is treated as a timestamp and
+	the time window of the retained rows is tracked.
+	"""
+
+	def __init__(self, variant:int=3, numCols:int=3, capacity:int=4*1024*1024, originRefreshInterval:int=100, timeCol:int=None):
+		if (variant not in (1, 2, 3)):
+			raise ValueError("Ring buffers support RDES1, RDES2 & RDES3")
+		if (originRefreshInterval <= 0):
+			raise ValueError("originRefreshInterval must be > 0; blocks are dropped at raw rows")
+		## A full block (every value raw) must fit beside the next row
+		if (capacity < (originRefreshInterval + 1) * numCols * 4):
+			raise ValueError(f"capacity must be at least {(originRefreshInterval + 1) * numCols * 4} bytes "
+				"(one refresh block of raw values)")
+		# Number of columns per row
+		self.__numCols = numCols
+		# Rows per refresh block (1 raw + originRefreshInterval compressed)
+		self.__blockRows = originRefreshInterval + 1
+		# Column holding timestamps (None = no time accounting)
+		self.__timeCol = timeCol
+		# Ring storage
+		self.__buffer = bytearray(capacity)
+		# Encoder; its output is taken after every write
+		self.__comp = RDESCompressor(variant=variant, numCols=numCols, originRefreshInterval=originRefreshInterval)
+		self.reset()
+
+
+	def reset(self):
+		"""
+		Resets the compressor, discarding all data.
+		"""
+		self.__comp.reset()
+		# Index of the next byte to write, and of the oldest byte
+		self.__head = 0
+		self.__tail = 0
+		# Bytes in use
+		self.__used = 0
+		# Retained blocks, oldest first: [bytes, rows, first time, last time]
+		self.__blocks = deque()
+		# Rows written & rows dropped since the reset
+		self.__rowsWritten = 0
+		self.__rowsDropped = 0
+		self.__blocksDropped = 0
+
+
+	def writeCompressedRow(self, data:list):
+		"""
+		Compresses a row into the buffer, dropping the oldest
+		blocks if it does not fit.
+		"""
+		self.__comp.writeCompressedRow(data)
+		self.__append(self.__comp.takeCompressedData(), [data])
+
+
+	def writeCompressedRows(self, rows):
+		"""
+		Compresses a sequence of rows (lists of values) into the
+		buffer; see writeCompressedRow(). Rows are encoded a refresh
+		block at a time.
+		"""
+		comp = self.__comp
+		blockRows = self.__blockRows
+		start = 0
+		while (start < len(rows)):
+			## Up to the end of the current block
+			end = min(start + blockRows - (self.__rowsWritten % blockRows), len(rows))
+			segment = rows[start:end]
+			comp.writeCompressedRows(segment)
+			self.__append(comp.takeCompressedData(), segment)
+			start = end
+
+
+	def __append(self, data, rows):
+		"""
+		Writes the compressed bytes of rows (all in the current
+		block, or starting a new one) at the head of the buffer.
+		"""
+		blocks = self.__blocks
+		timeCol = self.__timeCol
+		if (self.__rowsWritten % self.__blockRows == 0):
+			first = rows[0][timeCol] if (timeCol is not None) else None
+			blocks.append([0, 0, first, first])
+		current = blocks[-1]
+
+		## Make room, oldest blocks first (the current block always
+		## fits; see the capacity check)
+		size = len(data)
+		capacity = len(self.__buffer)
+		while (self.__used + size > capacity):
+			oldest = blocks.popleft()
+			self.__tail = (self.__tail + oldest[0]) % capacity
+			self.__used -= oldest[0]
+			self.__rowsDropped += oldest[1]
+			self.__blocksDropped += 1
+
+		## Write, wrapping around the end
+		head = self.__head
+		split = min(size, capacity - head)
+		self.__buffer[head:head+split] = data[:split]
+		self.__buffer[:size-split] = data[split:]
+		self.__head = (head + size) % capacity
+		self.__used += size
+
+		current[0] += size
+		current[1] += len(rows)
+		if (timeCol is not None):
+			current[3] = rows[-1][timeCol]
+		self.__rowsWritten += len(rows)
+
+
+	def getCompressedData(self):
+		"""
+		Returns the retained compressed data, oldest first, as one
+		stream (starting with a raw row).
+
+		Returns: bytearray
+		"""
+		tail = self.__tail
+		end = tail + self.__used
+		if (end <= len(self.__buffer)):
+			return self.__buffer[tail:end]
+		return self.__buffer[tail:] + self.__buffer[:end - len(self.__buffer)]
+
+
+	def getCapacity(self):
+		"""
+		Returns the size of the buffer (bytes).
+		"""
+		return len(self.__buffer)
+
+
+	def getCompressedSize(self):
+		"""
+		Returns the size of the retained compressed data (bytes).
+		"""
+		return self.__used
+
+
+	def getUncompressedSize(self):
+		"""
+		Returns the size of the retained rows (4 bytes per value).
+		"""
+		return self.getRetainedRows() * self.__numCols * 4
+
+
+	def getCompressionRatio(self):
+		"""
+		Returns the compression ratio of the retained data.
+		"""
+		return self.getUncompressedSize() / self.__used
+
+
+	def getRetainedRows(self):
+		"""
+		Returns the number of rows in the buffer.
+		"""
+		return self.__rowsWritten - self.__rowsDropped
+
+
+	def getDroppedRows(self):
+		"""
+		Returns the number of rows dropped to make room.
+		"""
+		return self.__rowsDropped
+
+
+	def getBlockCount(self):
+		"""
+		Returns (blocks retained, blocks dropped).
+		"""
+		return len(self.__blocks), self.__blocksDropped
+
+
+	def getRowWindow(self):
+		"""
+		Returns the (first, last + 1) indexes of the retained rows,
+		counting every row written since the reset.
+		"""
+		return self.__rowsDropped, self.__rowsWritten
+
+
+	def getTimeWindow(self):
+		"""
+		Returns the timestamps of the oldest & newest retained rows
+		(None if empty). Requires timeCol.
+		"""
+		if (self.__timeCol is None):
+			raise ValueError("No timeCol was given")
+		if (not self.__blocks):
+			return None
+		return self.__blocks[0][2], self.__blocks[-1][3]
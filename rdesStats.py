@@ -0,0 +1,232 @@
+"""
+Date: Oct.19.2026
+
+Description: Low-overhead counters for RDES compressors & decompressors.
+			 Disabled unless an RDESStats object is handed to the codec.
+"""
+
+
+## Number of value bits available at each storage level (1/2/3 bytes)
+## for every RDES variant. Offsets wider than this are stored raw (4 bytes).
+LEVEL_BITS = {
+	1: {3: 22},
+	2: {2: 13, 3: 21},
+	3: {1: 5, 2: 12, 3: 20},
+}
+
+
+class RDESStats():
+	"""
+	A collection of counters describing how an RDES stream
+	is being encoded, per column.
+
+	Records the bit-width of every offset (rather than the level
+	it was stored at), so the level histogram of any variant can be
+	derived from it. This makes it possible to tell when a column's
+	behaviour has drifted enough that a different variant would
+	produce a smaller stream.
+
+	Hand the same object to an RDESCompressor and an RDESDecompressor
+	to collect encode & decode timings in one place.
+	"""
+
+	def __init__(self, variant:int=3, numCols:int=3):
+		# The RDES variant levels are reported for
+		self.__variant = variant
+		# Number of columns in the virtual table
+		self.__numCols = numCols
+		self.reset()
+
+
+	def reset(self):
+		"""
+		Clears all counters.
+		"""
+		# Offset bit-length histogram per column (index = bits, 0-32)
+		self.__bitLengths = [[0]*33 for i in range(self.__numCols)]
+		# Negative offsets per column (the rest were positive or zero)
+		self.__subtractions = [0]*self.__numCols
+		# Rows written raw (first row & origin refreshes)
+		self.__rawRows = 0
+		# Rows encoded / decoded
+		self.__rowsEncoded = 0
+		self.__rowsDecoded = 0
+		# Bytes produced / consumed
+		self.__bytesEncoded = 0
+		self.__bytesDecoded = 0
+		# Cumulative time spent (seconds)
+		self.__encodeTime = 0.0
+		self.__decodeTime = 0.0
+
+
+	def recordRawRow(self):
+		"""
+		Notes that an entire row was written raw (uncompressed).
+		"""
+		self.__rawRows += 1
+
+
+	def recordRow(self, lastVals, data):
+		"""
+		Records the offsets between the previous row and the
+		new row of a single column-set.
+
+		Must be called before the compressor updates its state.
+		"""
+		bitLengths = self.__bitLengths
+		subtractions = self.__subtractions
+		for i in range(self.__numCols):
+			offset = data[i] - lastVals[i]
+			if (offset < 0):
+				subtractions[i] += 1
+				offset = -offset
+			bitLengths[i][offset.bit_length()] += 1
+
+
+	def recordEncode(self, rows, numBytes, seconds):
+		"""
+		Adds the given work to the encode totals.
+		"""
+		self.__rowsEncoded += rows
+		self.__bytesEncoded += numBytes
+		self.__encodeTime += seconds
+
+
+	def recordDecode(self, rows, numBytes, seconds):
+		"""
+		Adds the given work to the decode totals.
+		"""
+		self.__rowsDecoded += rows
+		self.__bytesDecoded += numBytes
+		self.__decodeTime += seconds
+
+
+	def getLevelHistogram(self, col:int, variant:int=None):
+		"""
+		Returns the number of offsets in the given column that
+		were (or would be) stored at each level, as a dict of
+		{bytes: count}. Raw rows are not included.
+
+		Defaults to the variant the stats were created for; the
+		bit-packed RDES4 has no levels, so RDES3's are used for it
+		(see getBitHistogram()).
+		"""
+		if (variant is None): variant = self.__variant
+		levels = LEVEL_BITS.get(variant, LEVEL_BITS[3])
+		hist = {lvl: 0 for lvl in levels}
+		hist[4] = 0
+		for bits, count in enumerate(self.__bitLengths[col]):
+			if (count == 0): continue
+			for lvl in sorted(levels):
+				if (bits <= levels[lvl]):
+					hist[lvl] += count
+					break
+			else:
+				hist[4] += count
+		return hist
+
+
+	def getBitHistogram(self, col:int):
+		"""
+		Returns the number of offsets in the given column of each
+		bit-width, as a list indexed by width (0-32).
+		"""
+		return list(self.__bitLengths[col])
+
+
+	def getSignCounts(self, col:int):
+		"""
+		Returns the number of (additions, subtractions)
+		recorded for the given column.
+		"""
+		total = sum(self.__bitLengths[col])
+		return (total - self.__subtractions[col], self.__subtractions[col])
+
+
+	def estimateSizes(self):
+		"""
+		Returns the number of bytes each RDES variant would
+		have needed for the recorded data, as a dict of
+		{variant: bytes}.
+		"""
+		sizes = {}
+		for variant in LEVEL_BITS:
+			size = self.__rawRows * self.__numCols * 4
+			for col in range(self.__numCols):
+				hist = self.getLevelHistogram(col, variant)
+				size += sum(lvl*count for lvl, count in hist.items())
+			sizes[variant] = size
+		return sizes
+
+
+	def getBestVariant(self):
+		"""
+		Returns the RDES variant that would have produced the
+		smallest stream for the recorded data.
+		"""
+		sizes = self.estimateSizes()
+		return min(sizes, key=sizes.get)
+
+
+	def asDict(self):
+		"""
+		Returns all counters as a (JSON-friendly) dictionary.
+		"""
+		columns = []
+		for col in range(self.__numCols):
+			adds, subs = self.getSignCounts(col)
+			columns.append({
+				"levels": self.getLevelHistogram(col),
+				"add": adds,
+				"sub": subs,
+			})
+		return {
+			"variant": self.__variant,
+			"rawRows": self.__rawRows,
+			"rowsEncoded": self.__rowsEncoded,
+			"rowsDecoded": self.__rowsDecoded,
+			"bytesEncoded": self.__bytesEncoded,
+			"bytesDecoded": self.__bytesDecoded,
+			"encodeSeconds": self.__encodeTime,
+			"decodeSeconds": self.__decodeTime,
+			"columns": columns,
+		}
+
+
+	def toPrometheus(self, prefix:str="rdes", labels:dict=None):
+		"""
+		Returns all counters in the Prometheus text exposition format.
+
+		Extra labels (e.g. {"stream": "imu0"}) are added to every sample.
+		"""
+		base = "".join(f',{k}="{v}"' for k, v in (labels or {}).items())
+		lines = []
+
+		def metric(name, help, samples):
+			lines.append(f"# HELP {prefix}_{name} {help}")
+			lines.append(f"# TYPE {prefix}_{name} counter")
+			for extra, value in samples:
+				lbl = (extra + base).lstrip(",")
+				lbl = "{" + lbl + "}" if lbl else ""
+				lines.append(f"{prefix}_{name}{lbl} {value}")
+
+		metric("raw_rows_total", "Rows written uncompressed.", [("", self.__rawRows)])
+		metric("rows_encoded_total", "Rows encoded.", [("", self.__rowsEncoded)])
+		metric("rows_decoded_total", "Rows decoded.", [("", self.__rowsDecoded)])
+		metric("bytes_encoded_total", "Compressed bytes produced.", [("", self.__bytesEncoded)])
+		metric("bytes_decoded_total", "Compressed bytes consumed.", [("", self.__bytesDecoded)])
+		metric("encode_seconds_total", "Time spent encoding.", [("", self.__encodeTime)])
+		metric("decode_seconds_total", "Time spent decoding.", [("", self.__decodeTime)])
+
+		levels = []
+		signs = []
+		for col in range(self.__numCols):
+			for lvl, count in self.getLevelHistogram(col).items():
+				levels.append((f'column="{col}",bytes="{lvl}"', count))
+			adds, subs = self.getSignCounts(col)
+			signs.append((f'column="{col}",sign="add"', adds))
+			signs.append((f'column="{col}",sign="sub"', subs))
+		metric("level_total", "Offsets stored at each level.", levels)
+		metric("sign_total", "Offsets by sign.", signs)
+
+		return "\n".join(lines) + "\n"
@@ -0,0 +1,471 @@
+"""
+Date: Oct.19.2026
+
+Description: A small chunked time-series store built on RDES, with
+			 time-range queries and a cache of decoded chunks.
+"""
+
+from rdes import RDESCompressor, RDESDecompressor
+from rdesCache import RDESBlockCache
+from bisect import bisect_left
+import struct
+import os
+import re
+
+
+## Index file layouts; little-endian
+INDEX_MAGIC = b"RDSI"
+# Version 2 adds per-column chunk summaries; version 1 is still read
+INDEX_VERSION = 2
+# magic, version, variant, numCols, number of signed columns
+INDEX_HEADER = struct.Struct("<4sBBHH")
+# data offset, data length, rows, first timestamp, last timestamp
+INDEX_RECORD = struct.Struct("<QIIqq")
+# min, max, sum of one column (follows each record, per column; v2)
+INDEX_SUMMARY = struct.Struct("<qqq")
+
+## Aggregates answered by aggregate()
+AGGREGATES = ("min", "max", "sum", "count", "mean")
+
+## Offset added by RDESCompressor.unsignify()
+SIGN_OFFSET = ((2**30)-1)//2
+## Largest value RDES can store (31 bits)
+MAX_VALUE = (2**31)-1
+
+## Series names double as file names
+SERIES_NAME = re.compile(r"^[A-Za-z0-9_.\-]+$")
+
+
+def _summarize(rows, numCols):
+	"""
+	Returns [(min, max, sum) per column] of the given rows.
+	"""
+	summary = []
+	for col in range(numCols):
+		vals = [row[col] for row in rows]
+		summary.append((min(vals), max(vals), sum(vals)))
+	return summary
+
+
+def _combine(acc, colMin, colMax, colSum, count):
+	"""
+	Folds a (min, max, sum, count) summary into an accumulator dict.
+	"""
+	if (count == 0):
+		return
+	acc["min"] = colMin if (acc["min"] is None) else min(acc["min"], colMin)
+	acc["max"] = colMax if (acc["max"] is None) else max(acc["max"], colMax)
+	acc["sum"] += colSum
+	acc["count"] += count
+
+
+class _Series():
+	"""
+	The in-memory index & unsealed rows of one series.
+	"""
+
+	def __init__(self, name, variant, numCols, signedCols, version=INDEX_VERSION):
+		self.name = name
+		self.version = version
+		self.variant = variant
+		self.numCols = numCols
+		self.signedCols = list(signedCols)
+		# (offset, length, rows, tMin, tMax) per sealed chunk
+		self.chunks = []
+		# Last timestamp of each sealed chunk (for bisecting)
+		self.tMaxs = []
+		# [(min, max, sum) per column] per sealed chunk (None for v1)
+		self.summaries = []
+		# Rows appended since the last sealed chunk
+		self.openRows = []
+
+
+class RDESStore():
+	"""
+	A local time-series store using RDES as its storage engine.
+
+	Each series is a table whose column 0 is an (integer, non-
+	decreasing) timestamp. Rows are kept in memory until chunkRows
+	have been appended, then sealed into a chunk: an independently
+	decodable RDES stream (starting with a raw row) appended to the
+	series' .rdes data file, with a record in its .idx index file
+	holding the chunk's position and min/max timestamps.
+
+	Timestamps are stored relative to the first timestamp of their
+	chunk, so they may exceed 31 bits (e.g. Unix milliseconds).
+
+	query() only decodes chunks overlapping the requested window;
+	decoded chunks are kept in an LRU cache bounded by cacheBytes
+	(or in a shared RDESBlockCache, keyed by data file & chunk).
+
+	NOTE: Unsealed rows are only written to disk by flush()/close().
+	"""
+
+	def __init__(self, path:str, variant:int=3, chunkRows:int=4096, cacheBytes:int=64*2**20, cache:RDESBlockCache=None):
+		# Directory holding the series files
+		self.__path = path
+		# RDES variant for new series
+		self.__variant = variant
+		# Rows per sealed chunk
+		self.__chunkRows = chunkRows
+		# Decoded chunk cache; keyed by (data file, chunk index)
+		self.__cache = cache if (cache is not None) else RDESBlockCache(cacheBytes)
+		# name -> _Series
+		self.__series = {}
+
+		os.makedirs(path, exist_ok=True)
+		for fileName in sorted(os.listdir(path)):
+			if (fileName.endswith(".idx")):
+				self.__loadSeries(fileName[:-4])
+
+
+	def __enter__(self):
+		return self
+
+
+	def __exit__(self, *exc):
+		self.close()
+
+
+	def __filePath(self, name, ext):
+		"""
+		Returns the path of one of a series' files.
+		"""
+		return os.path.join(self.__path, name + ext)
+
+
+	def __loadSeries(self, name):
+		"""
+		Loads a series' index file.
+		"""
+		with open(self.__filePath(name, ".idx"), "rb") as f:
+			raw = f.read()
+		magic, version, variant, numCols, numSigned = INDEX_HEADER.unpack_from(raw)
+		if (magic != INDEX_MAGIC or version not in (1, 2)):
+			raise ValueError(f"{name}.idx is not an RDES store index")
+		pos = INDEX_HEADER.size
+		signedCols = struct.unpack_from(f"<{numSigned}H", raw, pos)
+		pos += 2*numSigned
+
+		series = _Series(name, variant, numCols, signedCols, version)
+		recordSize = INDEX_RECORD.size
+		if (version >= 2):
+			recordSize += numCols * INDEX_SUMMARY.size
+		while (pos + recordSize <= len(raw)):
+			record = INDEX_RECORD.unpack_from(raw, pos)
+			summary = None
+			if (version >= 2):
+				summary = [INDEX_SUMMARY.unpack_from(raw, pos + INDEX_RECORD.size + col*INDEX_SUMMARY.size)
+					for col in range(numCols)]
+			series.chunks.append(record)
+			series.tMaxs.append(record[4])
+			series.summaries.append(summary)
+			pos += recordSize
+		self.__series[name] = series
+
+		## Drop a partially written trailing record (e.g. after a crash)
+		if (pos < len(raw)):
+			with open(self.__filePath(name, ".idx"), "r+b") as f:
+				f.truncate(pos)
+
+
+	def createSeries(self, name:str, numCols:int, signedCols=[]):
+		"""
+		Creates an empty series. Column 0 is the timestamp; signedCols
+		are value columns which may hold negative values.
+
+		Series are also created on their first append() (with no
+		signed columns).
+		"""
+		if (name in self.__series):
+			raise ValueError(f"Series '{name}' already exists")
+		if (not SERIES_NAME.match(name)):
+			raise ValueError(f"Invalid series name '{name}'")
+		if (0 in signedCols):
+			raise ValueError("The timestamp column cannot be signed")
+
+		header = INDEX_HEADER.pack(INDEX_MAGIC, INDEX_VERSION, self.__variant, numCols, len(signedCols))
+		with open(self.__filePath(name, ".idx"), "wb") as f:
+			f.write(header + struct.pack(f"<{len(signedCols)}H", *signedCols))
+		open(self.__filePath(name, ".rdes"), "ab").close()
+		self.__series[name] = _Series(name, self.__variant, numCols, signedCols)
+
+
+	def getSeries(self):
+		"""
+		Returns the names of all series.
+		"""
+		return list(self.__series)
+
+
+	def __getSeries(self, name):
+		"""
+		Returns the _Series for the given name.
+		"""
+		series = self.__series.get(name)
+		if (series is None):
+			raise KeyError(f"Unknown series '{name}'")
+		return series
+
+
+	def __lastTimestamp(self, series):
+		"""
+		Returns the newest timestamp in a series, or None.
+		"""
+		if (series.openRows):
+			return series.openRows[-1][0]
+		if (series.tMaxs):
+			return series.tMaxs[-1]
+		return None
+
+
+	def append(self, name:str, rows):
+		"""
+		Appends rows ([timestamp, value, ...]) to a series.
+		Timestamps must not decrease, and every value must fit in 31
+		bits (after unsignify() for signed columns); otherwise a
+		ValueError is raised and none of the rows are appended.
+		"""
+		rows = [list(row) for row in rows]
+		if (not rows):
+			return
+		if (name not in self.__series):
+			self.createSeries(name, len(rows[0]))
+		series = self.__series[name]
+
+		last = self.__lastTimestamp(series)
+		signedCols = series.signedCols
+		for index, row in enumerate(rows):
+			if (len(row) != series.numCols):
+				raise ValueError(f"Series '{name}' has {series.numCols} columns, got {len(row)}")
+			if (last is not None and row[0] < last):
+				raise ValueError(f"Timestamps in series '{name}' must not decrease")
+			last = row[0]
+			for col in range(1, series.numCols):
+				val = row[col] + SIGN_OFFSET if (col in signedCols) else row[col]
+				if (not 0 <= val <= MAX_VALUE):
+					kind = "signed" if (col in signedCols) else "unsigned"
+					raise ValueError(f"Series '{name}' row {index}, column {col}: value {row[col]} "
+						f"does not fit in 31 bits ({kind} column)")
+
+		for row in rows:
+			## Seal early if relative timestamps would exceed 31 bits
+			if (series.openRows and row[0] - series.openRows[0][0] > (2**31)-1):
+				self.__seal(series)
+			series.openRows.append(row)
+			if (len(series.openRows) >= self.__chunkRows):
+				self.__seal(series)
+
+
+	def __seal(self, series):
+		"""
+		Compresses a series' open rows into a new chunk on disk.
+		"""
+		rows = series.openRows
+		if (not rows):
+			return
+		tMin = rows[0][0]
+		tMax = rows[-1][0]
+
+		comp = RDESCompressor(variant=series.variant, numCols=series.numCols)
+		signedCols = series.signedCols
+		for row in rows:
+			row = [comp.unsignify(val) if (col in signedCols) else val for col, val in enumerate(row)]
+			row[0] -= tMin
+			comp.writeCompressedRow(row)
+		data = comp.getCompressedData()
+
+		## Data first, then the index record that makes it visible
+		with open(self.__filePath(series.name, ".rdes"), "ab") as f:
+			offset = f.seek(0, os.SEEK_END)
+			f.write(data)
+		record = (offset, len(data), len(rows), tMin, tMax)
+		packed = INDEX_RECORD.pack(*record)
+		summary = None
+		if (series.version >= 2):
+			summary = _summarize(rows, series.numCols)
+			packed += b"".join(INDEX_SUMMARY.pack(*colSummary) for colSummary in summary)
+		with open(self.__filePath(series.name, ".idx"), "ab") as f:
+			f.write(packed)
+
+		series.chunks.append(record)
+		series.tMaxs.append(tMax)
+		series.summaries.append(summary)
+		series.openRows = []
+
+
+	def flush(self):
+		"""
+		Seals the open rows of every series, writing them to disk.
+		"""
+		for series in self.__series.values():
+			self.__seal(series)
+
+
+	def close(self):
+		"""
+		Flushes all series & drops their cached chunks.
+		"""
+		self.flush()
+		for name in self.__series:
+			self.__cache.invalidateFile(self.__filePath(name, ".rdes"))
+
+
+	def getCache(self):
+		"""
+		Returns the RDESBlockCache holding decoded chunks.
+		"""
+		return self.__cache
+
+
+	def __loadChunk(self, series, index):
+		"""
+		Returns (RDESTable, timestamp array) for a sealed chunk,
+		decoding it if it is not cached.
+		"""
+		dataFile = self.__filePath(series.name, ".rdes")
+		cached = self.__cache.get(dataFile, index)
+		if (cached is not None):
+			return cached
+
+		offset, length, rows, tMin, tMax = series.chunks[index]
+		with open(dataFile, "rb") as f:
+			f.seek(offset)
+			data = f.read(length)
+		deco = RDESDecompressor(variant=series.variant, numCols=series.numCols, signedCols=series.signedCols)
+		table = deco.decompressTable(data)
+
+		## Restore absolute timestamps
+		values = table.getValues()
+		for k in range(0, len(values), series.numCols):
+			values[k] += tMin
+		times = table.getColumn(0)
+
+		self.__cache.put(dataFile, index, (table, times), 8*(len(values) + len(times)))
+		return (table, times)
+
+
+	def __overlapping(self, series, t0, t1):
+		"""
+		Yields the indexes of sealed chunks which overlap
+		the window t0 <= timestamp < t1.
+		"""
+		## The first candidate ends at/after t0
+		for index in range(bisect_left(series.tMaxs, t0), len(series.chunks)):
+			if (series.chunks[index][3] >= t1):
+				break
+			yield index
+
+
+	def __coveredSummary(self, series, index, t0, t1, column):
+		"""
+		Returns (min, max, sum, count) of a column in a chunk lying
+		entirely inside the window, from its summary alone; or None
+		if the chunk must be decoded.
+		"""
+		summary = series.summaries[index]
+		offset, length, rows, tMin, tMax = series.chunks[index]
+		if (summary is None or tMin < t0 or tMax >= t1):
+			return None
+		return (*summary[column], rows)
+
+
+	def __windowValues(self, series, index, t0, t1, column):
+		"""
+		Returns the values of a column in a (decoded) chunk
+		within the window.
+		"""
+		table, times = self.__loadChunk(series, index)
+		return table.getColumn(column)[bisect_left(times, t0):bisect_left(times, t1)]
+
+
+	def query(self, name:str, t0:int, t1:int, columns=None):
+		"""
+		Returns the rows of a series with t0 <= timestamp < t1, as a
+		list of lists. Only chunks overlapping the window are decoded.
+
+		columns optionally selects (and orders) the columns returned,
+		by index (0 = timestamp).
+		"""
+		series = self.__getSeries(name)
+		columns = list(range(series.numCols)) if (columns is None) else list(columns)
+		result = []
+
+		## Sealed chunks
+		for index in self.__overlapping(series, t0, t1):
+			table, times = self.__loadChunk(series, index)
+			for row in range(bisect_left(times, t0), bisect_left(times, t1)):
+				vals = table.getRow(row)
+				result.append([vals[col] for col in columns])
+
+		## Rows not sealed yet
+		for vals in series.openRows:
+			if (t0 <= vals[0] < t1):
+				result.append([vals[col] for col in columns])
+		return result
+
+
+	def aggregate(self, name:str, t0:int, t1:int, column:int):
+		"""
+		Returns the min, max, sum, count & mean of a column over the
+		rows with t0 <= timestamp < t1, as a dictionary (min, max &
+		mean are None if there are no such rows).
+
+		Chunks lying entirely inside the window are answered from the
+		summaries in the index alone; only the chunks at the edges
+		of the window are decoded.
+		"""
+		series = self.__getSeries(name)
+		acc = {"min": None, "max": None, "sum": 0, "count": 0}
+
+		for index in self.__overlapping(series, t0, t1):
+			covered = self.__coveredSummary(series, index, t0, t1, column)
+			if (covered is not None):
+				_combine(acc, *covered)
+				continue
+			vals = self.__windowValues(series, index, t0, t1, column)
+			if (vals):
+				_combine(acc, min(vals), max(vals), sum(vals), len(vals))
+
+		vals = [row[column] for row in series.openRows if (t0 <= row[0] < t1)]
+		if (vals):
+			_combine(acc, min(vals), max(vals), sum(vals), len(vals))
+
+		acc["mean"] = (acc["sum"] / acc["count"]) if acc["count"] else None
+		return acc
+
+
+	def aggregateWindows(self, name:str, t0:int, t1:int, column:int, width:int):
+		"""
+		Returns aggregate() results for consecutive windows of the
+		given width (e.g. one minute) covering t0 <= timestamp < t1,
+		as a list of (window start, aggregates) pairs.
+		"""
+		return [(start, self.aggregate(name, start, min(start + width, t1), column))
+			for start in range(t0, t1, width)]
+
+
+	def countAbove(self, name:str, t0:int, t1:int, column:int, threshold:int):
+		"""
+		Returns how many rows with t0 <= timestamp < t1 have a value
+		above threshold in the given column.
+
+		Chunks inside the window whose summary max is at/below (or
+		min is above) the threshold are answered without decoding.
+		"""
+		series = self.__getSeries(name)
+		count = 0
+		for index in self.__overlapping(series, t0, t1):
+			covered = self.__coveredSummary(series, index, t0, t1, column)
+			if (covered is not None):
+				colMin, colMax, colSum, rows = covered
+				if (colMax <= threshold):
+					continue
+				if (colMin > threshold):
+					count += rows
+					continue
+			vals = self.__windowValues(series, index, t0, t1, column)
+			count += sum(1 for val in vals if (val > threshold))
+
+		count += sum(1 for row in series.openRows if (t0 <= row[0] < t1 and row[column] > threshold))
+		return count
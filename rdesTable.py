@@ -0,0 +1,133 @@
+"""
+Date: Oct.19.2026
+
+Description: A compact, array-backed table of decompressed RDES data.
+"""
+
+from array import array
+
+
+class RDESTable():
+	"""
+	A table of decompressed values, stored as one flat row-major
+	array.array of 64-bit ints (8 bytes per value) rather than a
+	list of per-row lists of Python ints.
+
+	Produced by RDESDecompressor.decompressTable().
+
+	Behaves like the list-of-lists returned by decompress() for
+	indexing, iteration, len() and == comparison; rows are built
+	on demand. Columns are available as compact arrays.
+	"""
+
+	def __init__(self, values:array, numCols:int):
+		# Flat row-major values
+		self.__values = values
+		# Number of columns per row
+		self.__numCols = numCols
+		# (rows, columns)
+		self.shape = (len(values) // numCols, numCols)
+
+
+	def getValues(self):
+		"""
+		Returns the flat row-major array.array of all values
+		(no copy).
+		"""
+		return self.__values
+
+
+	def getColumn(self, col:int):
+		"""
+		Returns the values of the given column as a new
+		array.array.
+		"""
+		return self.__values[col::self.__numCols]
+
+
+	def getColumns(self):
+		"""
+		Returns a list of array.arrays, one per column.
+		"""
+		return [self.getColumn(col) for col in range(self.__numCols)]
+
+
+	def getRow(self, row:int):
+		"""
+		Returns the given row as a list.
+		"""
+		if (row < 0): row += self.shape[0]
+		if (row < 0 or row >= self.shape[0]):
+			raise IndexError("Row index out of range")
+		start = row * self.__numCols
+		return self.__values[start:start+self.__numCols].tolist()
+
+
+	def tolist(self):
+		"""
+		Returns the table as a list of lists, matching
+		the output of RDESDecompressor.decompress().
+		"""
+		return [row for row in self]
+
+
+	def toNumpy(self):
+		"""
+		Returns a zero-copy NumPy view of the table, shaped
+		(rows, columns). Requires NumPy.
+		"""
+		import numpy
+		return numpy.frombuffer(self.__values, dtype=numpy.int64).reshape(self.shape)
+
+
+	def toArrow(self, names:list=None):
+		"""
+		Returns the table as an Apache Arrow RecordBatch of int64
+		columns (named "0", "1", ... unless names are given). Each
+		column is one contiguous copy, wrapped without conversion.
+		Requires pyarrow.
+		"""
+		import pyarrow
+		names = names or [str(col) for col in range(self.__numCols)]
+		columns = [pyarrow.Array.from_buffers(pyarrow.int64(), self.shape[0], [None, pyarrow.py_buffer(column)])
+			for column in self.getColumns()]
+		return pyarrow.RecordBatch.from_arrays(columns, names=list(names))
+
+
+	def toPandas(self, names:list=None):
+		"""
+		Returns the table as a pandas DataFrame of int64 columns,
+		backed by the table's array without copying. Requires pandas.
+		"""
+		import pandas
+		return pandas.DataFrame(self.toNumpy(), columns=names, copy=False)
+
+
+	def __len__(self):
+		return self.shape[0]
+
+
+	def __getitem__(self, index):
+		if (isinstance(index, slice)):
+			return [self.getRow(row) for row in range(*index.indices(self.shape[0]))]
+		return self.getRow(index)
+
+
+	def __iter__(self):
+		values = self.__values
+		numCols = self.__numCols
+		for start in range(0, self.shape[0] * numCols, numCols):
+			yield values[start:start+numCols].tolist()
+
+
+	def __eq__(self, other):
+		if (isinstance(other, RDESTable)):
+			return self.shape == other.shape and self.__values == other.getValues()
+		try:
+			return len(self) == len(other) and all(a == list(b) for a, b in zip(self, other))
+		except TypeError:
+			return NotImplemented
+
+
+	def __repr__(self):
+		return f"RDESTable(rows={self.shape[0]}, cols={self.shape[1]})"
@@ -0,0 +1,333 @@
+"""
+Date: Oct.19.2026
+
+Description: RDES with a first-class timestamp channel; regularly sampled
+			 timestamps are stored as a start time & period per block.
+"""
+
+from rdes import RDESCompressor, RDESDecompressor
+from collections import Counter
+from bisect import bisect_left
+import struct
+
+
+## Timestamp encodings of a block
+MODE_IMPLICIT = 0 # start + period per row, plus exceptions
+MODE_EXPLICIT = 1 # RDES column of (timestamp - start)
+
+## Block layout (little-endian):
+# mode, rows, start time, period, timestamp section length, value section length
+TIME_BLOCK_HEADER = struct.Struct("<BHqIII")
+# row (within block), deviation from the predicted timestamp
+TIME_EXCEPTION = struct.Struct("<Hi")
+
+## Limits
+MAX_BLOCK_ROWS = 2**16 - 1
+MAX_SPAN = 2**31 - 1
+INT32_MIN = -2**31
+INT32_MAX = 2**31 - 1
+
+
+class RDESTimedCompressor():
+	"""
+	Compresses rows whose first column is a timestamp (any 64-bit
+	integer, e.g. milliseconds). The other columns are compressed
+	by RDES as usual (unsigned; see RDESCompressor.unsignify()).
+
+	Rows are grouped into blocks of up to blockRows rows. For each
+	block the timestamps are stored as a start time and a period
+	(the most common step); row k is predicted at the previous
+	timestamp + period, and only rows that deviate (jitter, gaps)
+	are stored, as exceptions. If exceptions would cost more than
+	storing the timestamps, the block stores them explicitly as an
+	RDES column instead. Each block is independently decodable, so
+	a time can be located without decoding any values.
+
+	Compressed data is produced one block at a time; call flush()
+	to seal a partly filled block.
+	"""
+
+	def __init__(self, variant:int=3, numCols:int=3, originRefreshInterval:int=0, blockRows:int=1024):
+		if (not 1 <= blockRows <= MAX_BLOCK_ROWS):
+			raise ValueError(f"blockRows must be 1..{MAX_BLOCK_ROWS}")
+		# The RDES variant
+		self.__variant = variant
+		# Number of columns per row, including the timestamp
+		self.__numCols = numCols
+		# Maximum rows per block
+		self.__blockRows = blockRows
+		# Compressor for the value columns of the current block
+		# (None for timestamp-only rows)
+		self.__values = None
+		if (numCols > 1):
+			self.__values = RDESCompressor(variant=variant, numCols=numCols-1, originRefreshInterval=originRefreshInterval)
+		self.reset()
+
+
+	def reset(self):
+		"""
+		Resets the compressor, discarding all data.
+		"""
+		# Sealed blocks
+		self.__compressed = bytearray()
+		# Timestamps of the current block
+		self.__times = []
+		if (self.__values is not None): self.__values.reset()
+		# Rows written & blocks sealed
+		self.__rowsCompressed = 0
+		self.__blocks = 0
+
+
+	def writeCompressedRow(self, row):
+		"""
+		Adds a row ([timestamp, value, ...]) to the current block,
+		sealing it first if it is full or the row's timestamp is too
+		far (over 2^31-1) from the block's others.
+		"""
+		times = self.__times
+		t = row[0]
+		if (times and (len(times) >= self.__blockRows or max(t, self.__tMax) - min(t, self.__tMin) > MAX_SPAN)):
+			self.flush()
+			times = self.__times
+		if (not times):
+			self.__tMin = self.__tMax = t
+		else:
+			self.__tMin = min(self.__tMin, t)
+			self.__tMax = max(self.__tMax, t)
+		times.append(t)
+		if (self.__values is not None): self.__values.writeCompressedRow(row[1:])
+		self.__rowsCompressed += 1
+
+
+	def writeCompressedRows(self, rows):
+		"""
+		Adds several rows; see writeCompressedRow().
+		"""
+		for row in rows:
+			self.writeCompressedRow(row)
+
+
+	def flush(self):
+		"""
+		Seals the current block (if it has any rows), making
+		its data available.
+		"""
+		times = self.__times
+		if (not times):
+			return
+		mode, start, period, timeData = self.__encodeTimes(times)
+		values = b""
+		if (self.__values is not None):
+			values = self.__values.getCompressedData()
+			self.__values.reset()
+		self.__compressed += TIME_BLOCK_HEADER.pack(mode, len(times), start, period, len(timeData), len(values))
+		self.__compressed += timeData
+		self.__compressed += values
+		self.__times = []
+		self.__blocks += 1
+
+
+	def __encodeTimes(self, times):
+		"""
+		Picks the smaller timestamp encoding for a block.
+
+		Returns (mode, start time, period, timestamp section).
+		"""
+		steps = [b - a for a, b in zip(times, times[1:])]
+		period = Counter(steps).most_common(1)[0][0] if steps else 0
+
+		## Implicit: start + period, with exceptions
+		exceptions = None
+		if (0 <= period <= MAX_SPAN):
+			exceptions = bytearray()
+			for row, step in enumerate(steps, 1):
+				if (step != period):
+					deviation = step - period
+					if (not INT32_MIN <= deviation <= INT32_MAX):
+						exceptions = None
+						break
+					exceptions += TIME_EXCEPTION.pack(row, deviation)
+			if (exceptions is not None and not exceptions):
+				return MODE_IMPLICIT, times[0], period, exceptions
+
+		## Explicit: offsets from the block's earliest timestamp
+		start = self.__tMin
+		comp = RDESCompressor(variant=self.__variant, numCols=1)
+		for t in times:
+			comp.writeCompressedRow([t - start])
+		explicit = comp.getCompressedData()
+		if (exceptions is not None and len(exceptions) <= len(explicit)):
+			return MODE_IMPLICIT, times[0], period, exceptions
+		return MODE_EXPLICIT, start, 0, explicit
+
+
+	def getCompressedData(self):
+		"""
+		Returns the compressed data of all sealed blocks
+		(see flush()).
+		"""
+		return self.__compressed
+
+
+	def takeCompressedData(self):
+		"""
+		Returns the compressed data of all sealed blocks and
+		starts a new, empty cache (the current block is kept).
+		"""
+		data = self.__compressed
+		self.__compressed = bytearray()
+		return data
+
+
+	def getBlockCount(self):
+		"""
+		Returns the number of sealed blocks.
+		"""
+		return self.__blocks
+
+
+	def getUncompressedSize(self):
+		"""
+		Returns the size of all rows written (4 bytes per
+		value, like RDESCompressor).
+		"""
+		return self.__rowsCompressed * self.__numCols * 4
+
+
+	def getCompressedSize(self):
+		"""
+		Returns the size of the sealed compressed data.
+		"""
+		return len(self.__compressed)
+
+
+	def getCompressionRatio(self):
+		"""
+		Returns the compression ratio of the sealed data.
+		"""
+		sealedRows = self.__rowsCompressed - len(self.__times)
+		return (sealedRows * self.__numCols * 4) / len(self.__compressed)
+
+
+
+class RDESTimedDecompressor():
+	"""
+	Decompresses data from RDESTimedCompressor, rebuilding each
+	block's timestamps from its start time, period & exceptions.
+
+	Variant, column & signify settings must match the compressor's;
+	signedCols index the full row (column 0 is the timestamp, which
+	is never re-signed).
+	"""
+
+	def __init__(self, variant:int=3, numCols:int=3, signedCols=[]):
+		# The RDES variant
+		self.__variant = variant
+		# Number of columns per row, including the timestamp
+		self.__numCols = numCols
+		# Signed value columns, as indexes into the value columns
+		self.__valueSigned = [col - 1 for col in signedCols if col > 0]
+		# Bytes of a block left unfinished by the previous input
+		self.__pending = b""
+
+
+	def __iterBlocks(self, data):
+		"""
+		Yields (offset, mode, rows, start, period, timestamp section,
+		value section) for every complete block in data; returns the
+		index after the last complete block.
+		"""
+		pos = 0
+		size = len(data)
+		while (pos + TIME_BLOCK_HEADER.size <= size):
+			mode, rows, start, period, timeLength, valueLength = TIME_BLOCK_HEADER.unpack_from(data, pos)
+			timeStart = pos + TIME_BLOCK_HEADER.size
+			valueStart = timeStart + timeLength
+			end = valueStart + valueLength
+			if (end > size):
+				break
+			yield pos, mode, rows, start, period, data[timeStart:valueStart], data[valueStart:end]
+			pos = end
+		return pos
+
+
+	def __decodeTimes(self, mode, rows, start, period, timeData):
+		"""
+		Rebuilds the timestamps of a block.
+		"""
+		if (mode == MODE_EXPLICIT):
+			deco = RDESDecompressor(variant=self.__variant, numCols=1)
+			return [start + row[0] for row in deco.decompress(timeData)]
+		if (mode != MODE_IMPLICIT):
+			raise ValueError(f"Unknown timestamp mode {mode}")
+
+		deviations = dict(TIME_EXCEPTION.iter_unpack(timeData))
+		times = [start]
+		t = start
+		for row in range(1, rows):
+			t += period + deviations.get(row, 0)
+			times.append(t)
+		return times
+
+
+	def decompress(self, bytes):
+		"""
+		Decompresses the provided data and returns the rows of every
+		complete block in it, as a list of [timestamp, value, ...]
+		lists. Bytes of an unfinished trailing block are kept and
+		prefixed to the next call's data.
+		"""
+		data = bytes
+		if (self.__pending):
+			data = bytearray(self.__pending)
+			data.extend(bytes)
+		decoded = []
+		blocks = self.__iterBlocks(data)
+		while True:
+			try:
+				offset, mode, rows, start, period, timeData, valueData = next(blocks)
+			except StopIteration as done:
+				end = done.value
+				break
+			times = self.__decodeTimes(mode, rows, start, period, timeData)
+			if (self.__numCols > 1):
+				deco = RDESDecompressor(variant=self.__variant, numCols=self.__numCols-1, signedCols=self.__valueSigned)
+				values = deco.decompress(valueData)
+			else:
+				values = [[]]*rows
+			decoded.extend([t] + vals for t, vals in zip(times, values))
+		self.__pending = data[end:]
+		return decoded
+
+
+	def readTimestamps(self, bytes):
+		"""
+		Returns the timestamps of every complete block in the data,
+		without decoding any values.
+		"""
+		times = []
+		for offset, mode, rows, start, period, timeData, valueData in self.__iterBlocks(bytes):
+			times.extend(self.__decodeTimes(mode, rows, start, period, timeData))
+		return times
+
+
+	def locate(self, bytes, t):
+		"""
+		Returns the index of the first row whose timestamp is at or
+		after t (timestamps must be non-decreasing), or the number
+		of rows if there is none. No values are decoded; in blocks
+		without exceptions the row is computed directly.
+		"""
+		first = 0
+		for offset, mode, rows, start, period, timeData, valueData in self.__iterBlocks(bytes):
+			if (mode == MODE_IMPLICIT and not timeData):
+				last = start + period*(rows-1)
+				if (t <= last):
+					if (t <= start): return first
+					return first + -(-(t - start) // period)
+			else:
+				times = self.__decodeTimes(mode, rows, start, period, timeData)
+				if (t <= times[-1]):
+					return first + bisect_left(times, t)
+			first += rows
+		return first